@@ -1,3 +1,6 @@
+from contextlib import contextmanager
+
+from app.core import storage
 from app.core.task_manager import TaskManager
 from app.core.plan_manager import PlanManager
 
@@ -7,61 +10,28 @@ class TaskTrackerAPI:
         """Initialize the TaskTrackerAPI with task and plan managers."""
         self.task_manager = task_manager or TaskManager()
         self.plan_manager = plan_manager or PlanManager()
-    
-    # Task methods
-    def get_all_tasks(self):
-        """Get all tasks."""
-        return self.task_manager.get_all_tasks()
-    
-    def get_task(self, task_id):
-        """Get a task by ID."""
-        return self.task_manager.get_task(task_id)
-    
-    def add_task(self, title, description="", priority=1, status="pending"):
-        """Add a new task."""
-        return self.task_manager.add_task(title, description, priority, status)
-    
-    def update_task(self, task_id, **kwargs):
-        """Update a task by ID."""
-        return self.task_manager.update_task(task_id, **kwargs)
-    
-    def delete_task(self, task_id):
-        """Delete a task by ID."""
-        return self.task_manager.delete_task(task_id)
-    
-    # Plan methods
-    def get_all_plan_steps(self):
-        """Get all plan steps."""
-        return self.plan_manager.get_all_steps()
-    
-    def get_plan_step(self, step_id):
-        """Get a plan step by ID."""
-        return self.plan_manager.get_step(step_id)
-    
-    def add_plan_step(self, name, description="", details="", order=None, completed=False):
-        """Add a new plan step."""
-        return self.plan_manager.add_step(name, description, details, order, completed)
-    
-    def update_plan_step(self, step_id, **kwargs):
-        """Update a plan step by ID."""
-        return self.plan_manager.update_step(step_id, **kwargs)
-    
-    def toggle_plan_step(self, step_id):
-        """Toggle the completion status of a plan step."""
-        return self.plan_manager.toggle_step(step_id)
-    
-    def delete_plan_step(self, step_id):
-        """Delete a plan step by ID."""
-        return self.plan_manager.delete_step(step_id)
-    
-    def reorder_plan_steps(self):
-        """Reorder plan steps to ensure consistent ordering."""
-        return self.plan_manager.reorder_steps()
-    
-    # Notes methods
-    def get_notes(self):
-        """Get the notes."""
-        return self.task_manager.get_notes()
+        
+        # Methods that map one-to-one onto a manager method are bound
+        # directly to the manager, saving a wrapper call on every use
+        
+        # Task methods
+        self.get_all_tasks = self.task_manager.get_all_tasks
+        self.get_task = self.task_manager.get_task
+        self.add_task = self.task_manager.add_task
+        self.update_task = self.task_manager.update_task
+        self.delete_task = self.task_manager.delete_task
+        
+        # Plan methods
+        self.get_all_plan_steps = self.plan_manager.get_all_steps
+        self.get_plan_step = self.plan_manager.get_step
+        self.add_plan_step = self.plan_manager.add_step
+        self.update_plan_step = self.plan_manager.update_step
+        self.toggle_plan_step = self.plan_manager.toggle_step
+        self.delete_plan_step = self.plan_manager.delete_step
+        self.reorder_plan_steps = self.plan_manager.reorder_steps
+        
+        # Notes methods
+        self.get_notes = self.task_manager.get_notes
     
     def save_notes(self, notes_text):
         """Save notes."""
@@ -70,11 +40,52 @@ class TaskTrackerAPI:
     
     # Data management
     def save_all(self):
-        """Save all data to files."""
-        self.task_manager.save_tasks()
-        self.plan_manager.save_plan()
+        """Save all pending changes to files."""
+        self.task_manager.flush()
+        self.plan_manager.flush()
         return True
         
+    def set_autosave(self, enabled):
+        """
+        Turn saving after every mutation on or off.
+        
+        While autosave is off, changes are kept in memory until save_all()
+        is called. Turning it back on saves any pending changes.
+        """
+        self.task_manager._autosave = enabled
+        self.plan_manager._autosave = enabled
+        if enabled:
+            self.save_all()
+    
+    def has_unsaved_changes(self):
+        """Return True if there are changes that haven't been saved yet."""
+        return self.task_manager._dirty or self.plan_manager._dirty
+        
+    @contextmanager
+    def batch(self):
+        """
+        Defer saving for the duration of a block of mutations.
+        
+        Changes made inside the block are written once on exit instead of
+        once per mutation:
+        
+            with api.batch():
+                for task_id in task_ids:
+                    api.update_task(task_id, status="completed")
+        """
+        managers = (self.task_manager, self.plan_manager)
+        previous = [manager._autosave for manager in managers]
+        for manager in managers:
+            manager._autosave = False
+        try:
+            yield self
+        finally:
+            for manager, autosave in zip(managers, previous):
+                manager._autosave = autosave
+            # Leave writing to the outermost batch when nested
+            if all(previous):
+                self.save_all()
+    
     def reload_all(self):
         """Reload all data from files (for external changes like MCP)."""
         self.task_manager.reload_tasks()
@@ -84,34 +95,44 @@ class TaskTrackerAPI:
     
     def export_data(self, file_path):
         """Export all data to a single JSON file."""
-        import json
         data = {
             "tasks": self.get_all_tasks(),
             "plan": self.get_all_plan_steps(),
             "notes": self.get_notes()
         }
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        storage.write_json(file_path, data)
         return True
     
     def import_data(self, file_path):
         """Import data from a JSON file."""
-        import json
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            # Clear existing data
-            self.task_manager.tasks = data.get("tasks", [])
-            self.plan_manager.plan_steps = data.get("plan", [])
-            
-            # Import notes if available
-            if "notes" in data:
-                self.task_manager.save_notes(data["notes"])
-            
-            # Save imported data
-            self.save_all()
-            return True
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+            data = storage.read_json(file_path)
+        except (storage.JSONDecodeError, FileNotFoundError) as e:
             print(f"Error importing data: {e}")
-            return False
\ No newline at end of file
+            return False
+        
+        # Check the whole document before replacing anything, so a bad
+        # import leaves the existing tasks, plan and notes untouched
+        if not isinstance(data, dict):
+            print("Error importing data: expected a JSON object")
+            return False
+        tasks = data.get("tasks", [])
+        steps = data.get("plan", [])
+        notes = data.get("notes")
+        if not (isinstance(tasks, list) and isinstance(steps, list)
+                and (notes is None or isinstance(notes, str))):
+            print("Error importing data: malformed tasks, plan or notes")
+            return False
+        
+        # Clear existing data; malformed records are dropped
+        self.task_manager.set_tasks(tasks)
+        self.plan_manager.set_steps(steps)
+        
+        # Import notes if available
+        if notes is not None:
+            self.task_manager.save_notes(notes)
+        
+        # Save imported data (deferred when inside a batch)
+        self.task_manager._mark_dirty()
+        self.plan_manager._mark_dirty()
+        return True
\ No newline at end of file
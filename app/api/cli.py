@@ -1,19 +1,18 @@
 import argparse
 import sys
-import os
 
-from app.api.api import TaskTrackerAPI
-from app.core.task_manager import TaskManager
-from app.core.plan_manager import PlanManager
 
+# Top-level commands and their help text
+_COMMANDS = {
+    'task': 'Task operations',
+    'plan': 'Plan operations',
+    'export': 'Export data to JSON file',
+    'import': 'Import data from JSON file',
+}
 
-def create_parser():
-    """Create the command line argument parser."""
-    parser = argparse.ArgumentParser(description='Terminal Task Tracker CLI')
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-    
-    # Task commands
-    task_parser = subparsers.add_parser('task', help='Task operations')
+
+def _build_task_parser(task_parser):
+    """Add the task subcommands to the task parser."""
     task_subparsers = task_parser.add_subparsers(dest='subcommand', help='Task subcommand')
     
     # task list
@@ -47,9 +46,10 @@ def create_parser():
     # task delete
     task_delete_parser = task_subparsers.add_parser('delete', help='Delete a task')
     task_delete_parser.add_argument('task_id', help='Task ID')
-    
-    # Plan commands
-    plan_parser = subparsers.add_parser('plan', help='Plan operations')
+
+
+def _build_plan_parser(plan_parser):
+    """Add the plan subcommands to the plan parser."""
     plan_subparsers = plan_parser.add_subparsers(dest='subcommand', help='Plan subcommand')
     
     # plan list
@@ -84,29 +84,66 @@ def create_parser():
     # plan delete
     plan_delete_parser = plan_subparsers.add_parser('delete', help='Delete a plan step')
     plan_delete_parser.add_argument('step_id', help='Step ID')
-    
-    # Export/Import commands
-    export_parser = subparsers.add_parser('export', help='Export data to JSON file')
+
+
+def _build_export_parser(export_parser):
+    """Add the export arguments to the export parser."""
     export_parser.add_argument('file_path', help='Path to export file')
-    
-    import_parser = subparsers.add_parser('import', help='Import data from JSON file')
+
+
+def _build_import_parser(import_parser):
+    """Add the import arguments to the import parser."""
     import_parser.add_argument('file_path', help='Path to import file')
+
+
+_COMMAND_BUILDERS = {
+    'task': _build_task_parser,
+    'plan': _build_plan_parser,
+    'export': _build_export_parser,
+    'import': _build_import_parser,
+}
+
+
+def create_parser(command=None):
+    """
+    Create the command line argument parser.
+    
+    If command names a known top-level command, only that command's
+    arguments are built; the others are registered bare so they still
+    show up in the help output.
+    """
+    parser = argparse.ArgumentParser(description='Terminal Task Tracker CLI')
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+    
+    if command not in _COMMANDS:
+        command = None
+    
+    for name, help_text in _COMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if command is None or command == name:
+            _COMMAND_BUILDERS[name](command_parser)
     
     return parser
 
 
 def main():
     """Main CLI entry point."""
-    parser = create_parser()
+    # Only build the parser tree for the command being run
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = create_parser(command)
     args = parser.parse_args()
     
-    # Initialize API
-    api = TaskTrackerAPI()
-    
     if not args.command:
         parser.print_help()
         return
     
+    # Initialize API
+    from app.api.api import TaskTrackerAPI
+    api = TaskTrackerAPI()
+    
+    # Multi-line output is assembled first and written in one call
+    _out = sys.stdout.write
+    
     try:
         # Task commands
         if args.command == 'task':
@@ -115,21 +152,31 @@ def main():
                 if not tasks:
                     print("No tasks found.")
                 else:
-                    print(f"{'ID':<36} {'Title':<30} {'Priority':<8} {'Status':<12}")
-                    print("-" * 90)
-                    for task in tasks:
-                        print(f"{task['id']:<36} {task['title'][:30]:<30} {task['priority']:<8} {task['status']:<12}")
+                    # Build the whole table and write it in one call
+                    lines = [
+                        f"{'ID':<32} {'Title':<30} {'Priority':<8} {'Status':<12}",
+                        "-" * 86,
+                    ]
+                    lines.extend(
+                        f"{task['id']:<32} {task['title'][:30]:<30} "
+                        f"{task['priority']:<8} {task['status']:<12}"
+                        for task in tasks
+                    )
+                    _out("\n".join(lines) + "\n")
             
             elif args.subcommand == 'show':
                 task = api.get_task(args.task_id)
                 if task:
-                    print(f"ID: {task['id']}")
-                    print(f"Title: {task['title']}")
-                    print(f"Description: {task['description']}")
-                    print(f"Priority: {task['priority']}")
-                    print(f"Status: {task['status']}")
-                    print(f"Created: {task['created_at']}")
-                    print(f"Updated: {task['updated_at']}")
+                    lines = [
+                        f"ID: {task['id']}",
+                        f"Title: {task['title']}",
+                        f"Description: {task['description']}",
+                        f"Priority: {task['priority']}",
+                        f"Status: {task['status']}",
+                        f"Created: {task['created_at']}",
+                        f"Updated: {task['updated_at']}",
+                    ]
+                    _out("\n".join(lines) + "\n")
                 else:
                     print(f"Task not found: {args.task_id}")
             
@@ -177,30 +224,40 @@ def main():
                 if not steps:
                     print("No plan steps found.")
                 else:
-                    print(f"{'Order':<6} {'Completed':<10} {'ID':<36} {'Description'}")
-                    print("-" * 90)
-                    for step in steps:
-                        completed = "[x]" if step['completed'] else "[ ]"
-                        print(f"{step['order']:<6} {completed:<10} {step['id']:<36} {step['description']}")
+                    # Build the whole table and write it in one call
+                    lines = [
+                        f"{'Order':<6} {'Completed':<10} {'ID':<32} {'Description'}",
+                        "-" * 86,
+                    ]
+                    lines.extend(
+                        f"{step['order']:<6} "
+                        f"{'[x]' if step['completed'] else '[ ]':<10} "
+                        f"{step['id']:<32} {step['description']}"
+                        for step in steps
+                    )
+                    _out("\n".join(lines) + "\n")
             
             elif args.subcommand == 'show':
                 step = api.get_plan_step(args.step_id)
                 if step:
                     completed = "Yes" if step['completed'] else "No"
-                    print(f"ID: {step['id']}")
-                    print(f"Name: {step.get('name', 'N/A')}")
-                    print(f"Description: {step.get('description', '')}")
-                    print(f"Order: {step.get('order', 0)}")
-                    print(f"Completed: {completed}")
+                    lines = [
+                        f"ID: {step['id']}",
+                        f"Name: {step.get('name', 'N/A')}",
+                        f"Description: {step.get('description', '')}",
+                        f"Order: {step.get('order', 0)}",
+                        f"Completed: {completed}",
+                    ]
                     
                     # Print details if available
                     details = step.get('details', '')
                     if details:
-                        print("\nDetails:")
-                        print(details)
+                        lines.append("\nDetails:")
+                        lines.append(details)
                         
-                    print(f"\nCreated: {step.get('created_at', 'N/A')}")
-                    print(f"Updated: {step.get('updated_at', 'N/A')}")
+                    lines.append(f"\nCreated: {step.get('created_at', 'N/A')}")
+                    lines.append(f"Updated: {step.get('updated_at', 'N/A')}")
+                    _out("\n".join(lines) + "\n")
                 else:
                     print(f"Plan step not found: {args.step_id}")
             
@@ -259,7 +316,8 @@ def main():
                 print("Error exporting data")
         
         elif args.command == 'import':
-            result = api.import_data(args.file_path)
+            with api.batch():
+                result = api.import_data(args.file_path)
             if result:
                 print(f"Data imported from {args.file_path}")
             else:
@@ -1,7 +1,7 @@
-import json
 import os
-import uuid
-from datetime import datetime
+from uuid import uuid4
+
+from app.core import storage
 
 
 class PlanManager:
@@ -14,99 +14,167 @@ class PlanManager:
             file_path = os.path.join(plan_dir, "plan.json")
         
         self.file_path = file_path
-        self.plan_steps = self._load_plan()
+        
+        # Plan steps are loaded from disk on first access
+        self._plan_steps = []
+        self._by_id = {}
+        self._loaded = False
+        
+        # Write-back state: with autosave off, mutations only mark the
+        # plan dirty and are written out by flush()
+        self._dirty = False
+        self._autosave = True
+        
+        # Bumped whenever the steps are loaded or changed, so readers can
+        # cheaply tell whether they need to redraw
+        self.version = 0
     
     def _load_plan(self):
         """Load plan steps from the file or return an empty list if file doesn't exist."""
         if os.path.exists(self.file_path):
             try:
-                with open(self.file_path, 'r') as f:
-                    data = json.load(f)
-                    # Ensure we always return a list
-                    if isinstance(data, list):
-                        return data
-                    elif isinstance(data, dict) and "steps" in data:
-                        return data["steps"]
-                    else:
-                        # If it's not a list or doesn't have steps key, return empty list
-                        return []
-            except (json.JSONDecodeError, IOError):
+                data = storage.read_json(self.file_path)
+                # Ensure we always return a list
+                if isinstance(data, list):
+                    return data
+                elif isinstance(data, dict) and "steps" in data:
+                    return data["steps"]
+                else:
+                    # If it's not a list or doesn't have steps key, return empty list
+                    return []
+            except (storage.JSONDecodeError, IOError):
                 return []
         return []
         
     def reload_plan(self):
         """Reload plan steps from file (for external changes like MCP)."""
-        self.plan_steps = self._load_plan()
+        # Drop the cached steps; they are re-read on next access
+        self._plan_steps = []
+        self._by_id = {}
+        self._loaded = False
+    
+    @property
+    def plan_steps(self):
+        """The plan step list, loaded from the file on first access."""
+        if not self._loaded:
+            self.set_steps(self._load_plan())
+        return self._plan_steps
+    
+    @plan_steps.setter
+    def plan_steps(self, steps):
+        self.set_steps(steps)
+    
+    def set_steps(self, steps):
+        """Replace all plan steps and rebuild the ID index."""
+        # Steps can come from untrusted JSON, so this is the one place
+        # they are validated; other methods rely on it. Validation and
+        # indexing happen in a single pass, dropping malformed records.
+        valid = []
+        by_id = {}
+        if isinstance(steps, list):
+            for step in steps:
+                # IDs are strings; anything else can't be looked up (or,
+                # for lists and dicts, even indexed)
+                if isinstance(step, dict) and isinstance(step.get("id"), str):
+                    # An order that isn't a number can't be sorted; such
+                    # steps go last
+                    if not isinstance(step.get("order", 0), (int, float)):
+                        step["order"] = float("inf")
+                    valid.append(step)
+                    by_id[step["id"]] = step
+        self._plan_steps = valid
+        self._by_id = by_id
+        self._loaded = True
+        self.version += 1
+        
+        # Normalize once so each step's order matches its list position
+        self.reorder_steps()
     
     def save_plan(self):
         """Save plan steps to the file."""
-        # Ensure plan_steps is a list before saving
-        if not isinstance(self.plan_steps, list):
-            self.plan_steps = []
-            
-        with open(self.file_path, 'w') as f:
-            json.dump(self.plan_steps, f, indent=2)
+        storage.write_json(self.file_path, self.plan_steps)
+        self._dirty = False
+    
+    def _mark_dirty(self):
+        """Record a mutation, saving immediately if autosave is enabled."""
+        self.version += 1
+        if self._autosave:
+            self.save_plan()
+        else:
+            self._dirty = True
+    
+    def flush(self):
+        """Save the plan only if there are unsaved changes."""
+        if self._dirty:
+            self.save_plan()
+            return True
+        return False
     
     def get_all_steps(self):
         """Return all plan steps."""
-        # Ensure we always return a list
-        if not isinstance(self.plan_steps, list):
-            self.plan_steps = []
         return self.plan_steps
     
     def get_step(self, step_id):
         """Get a plan step by ID."""
-        # Ensure plan_steps is a list
-        if not isinstance(self.plan_steps, list):
-            self.plan_steps = []
-            return None
-            
-        for step in self.plan_steps:
-            if step["id"] == step_id:
-                return step
-        return None
+        if not self._loaded:
+            self.set_steps(self._load_plan())
+        return self._by_id.get(step_id)
     
     def add_step(self, name, description="", details="", order=None, completed=False):
         """Add a new plan step."""
-        # Ensure plan_steps is a list
-        if not isinstance(self.plan_steps, list):
-            self.plan_steps = []
-        
-        if order is None:
+        if order is None or order > len(self.plan_steps):
             # Place at the end by default
             order = len(self.plan_steps)
+        elif order < 0:
+            order = 0
         
+        now = storage.now_iso()
         step = {
-            "id": str(uuid.uuid4()),
+            "id": uuid4().hex,
             "name": name,
             "description": description,
             "details": details,
             "order": order,
             "completed": completed,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
         
-        # Insert at the specified order
-        self.plan_steps.append(step)
-        self.reorder_steps()
-        self.save_plan()
+        # Insert at the specified order; only the steps after it need
+        # renumbering (none when appending at the end)
+        self.plan_steps.insert(order, step)
+        self._by_id[step["id"]] = step
+        self._renumber(order + 1, len(self.plan_steps))
+        self._mark_dirty()
         return step
     
-    def update_step(self, step_id, **kwargs):
-        """Update a plan step by ID."""
+    def update_step(self, step_id, name=None, description=None, details=None,
+                    order=None, completed=None):
+        """Update a plan step by ID; fields left as None are not changed."""
         step = self.get_step(step_id)
         if step:
-            for key, value in kwargs.items():
-                if key in step and key not in ["id", "created_at"]:
-                    step[key] = value
-            step["updated_at"] = datetime.now().isoformat()
+            changed = False
+            if name is not None and step.get("name") != name:
+                step["name"] = name
+                changed = True
+            if description is not None and step.get("description") != description:
+                step["description"] = description
+                changed = True
+            if details is not None and step.get("details") != details:
+                step["details"] = details
+                changed = True
+            if completed is not None and step.get("completed") != completed:
+                step["completed"] = completed
+                changed = True
             
-            # If order changed, reorder all steps
-            if "order" in kwargs:
-                self.reorder_steps()
-                
-            self.save_plan()
+            # Order changes move the step within the list
+            if order is not None and self._move_step(step, order):
+                changed = True
+            
+            # Leave the file alone if nothing actually changed
+            if changed:
+                step["updated_at"] = storage.now_iso()
+                self._mark_dirty()
             return step
         return None
     
@@ -115,36 +183,55 @@ class PlanManager:
         step = self.get_step(step_id)
         if step:
             step["completed"] = not step["completed"]
-            step["updated_at"] = datetime.now().isoformat()
-            self.save_plan()
+            step["updated_at"] = storage.now_iso()
+            self._mark_dirty()
             return step
         return None
     
     def delete_step(self, step_id):
         """Delete a plan step by ID."""
-        # Ensure plan_steps is a list
-        if not isinstance(self.plan_steps, list):
-            self.plan_steps = []
-            return False
-            
         step = self.get_step(step_id)
         if step:
-            self.plan_steps.remove(step)
-            self.reorder_steps()
-            self.save_plan()
+            # A step's order is its list position, so no search is needed
+            idx = step["order"]
+            self.plan_steps.pop(idx)
+            del self._by_id[step_id]
+            
+            # Only the steps after the deleted one shift up
+            self._renumber(idx, len(self.plan_steps))
+            self._mark_dirty()
             return True
         return False
     
     def reorder_steps(self):
         """Reorder steps to ensure consistent ordering."""
-        # Ensure plan_steps is a list
-        if not isinstance(self.plan_steps, list):
-            self.plan_steps = []
-            return
-            
         # Sort by the current order
         self.plan_steps.sort(key=lambda x: x.get("order", 0))
         
         # Update order field to match actual position
         for i, step in enumerate(self.plan_steps):
-            step["order"] = i
\ No newline at end of file
+            step["order"] = i
+    
+    def _renumber(self, start, stop):
+        """Set the order of the steps in positions [start, stop) to their position."""
+        steps = self.plan_steps
+        for i in range(start, stop):
+            steps[i]["order"] = i
+    
+    def _move_step(self, step, new_order):
+        """
+        Move a step to a new position in the plan.
+        
+        The steps are kept sorted with each order equal to its list
+        position, so only the steps between the old and new position need
+        renumbering. Returns True if the step actually moved.
+        """
+        steps = self.plan_steps
+        old_order = step["order"]
+        new_order = max(0, min(new_order, len(steps) - 1))
+        if new_order == old_order:
+            return False
+        
+        steps.insert(new_order, steps.pop(old_order))
+        self._renumber(min(old_order, new_order), max(old_order, new_order) + 1)
+        return True
@@ -0,0 +1,95 @@
+import json
+import mmap
+import os
+import tempfile
+from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+# Both orjson.JSONDecodeError and json.JSONDecodeError derive from this
+JSONDecodeError = json.JSONDecodeError
+
+
+def now_iso():
+    """Return the current UTC time as an ISO 8601 string with second precision."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# The encoder is chosen and configured once rather than on every call;
+# json.dumps() with options builds a new JSONEncoder each time. Non-ASCII
+# text is written as UTF-8 either way, as orjson does.
+if orjson is not None:
+    _orjson_dumps = orjson.dumps
+    _DUMPS_OPTION = orjson.OPT_INDENT_2
+
+    def dumps(obj):
+        """Serialize obj to indented JSON bytes."""
+        return _orjson_dumps(obj, option=_DUMPS_OPTION)
+else:
+    _encode = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+
+    def dumps(obj):
+        """Serialize obj to indented JSON bytes."""
+        return _encode(obj).encode("utf-8")
+
+
+def loads(data):
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(file_path):
+    """Read and parse a JSON file.
+
+    With orjson the file is parsed straight from a read-only mmap, which
+    avoids holding an extra bytes copy of the whole file while parsing.
+    """
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file, and the stdlib parser needs bytes
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as buf:
+                return orjson.loads(buf)
+
+
+def atomic_write(file_path, data):
+    """Write bytes to file_path via a temporary file and an atomic rename.
+
+    The data is flushed to disk before the rename, so a crash mid-write
+    leaves the previous file intact instead of a truncated one. Each write
+    gets its own temporary file, so processes saving the same file at once
+    don't clobber each other's.
+    """
+    file_path = os.fspath(file_path)
+    directory, name = os.path.split(file_path)
+    # Raw descriptor writes: the data is already one buffer, so a buffered
+    # file object would only add overhead
+    fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp",
+                                    dir=directory or None)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(file_path, obj):
+    """Serialize obj and atomically write it to file_path."""
+    atomic_write(file_path, dumps(obj))
@@ -1,7 +1,15 @@
-import json
 import os
-import uuid
-from datetime import datetime
+import sys
+from uuid import uuid4
+
+from app.core import storage
+
+# Accepted task field values; the status strings are interned so status
+# comparisons on stored tasks can short-circuit on identity
+VALID_STATUSES = frozenset(
+    sys.intern(s) for s in ("not_started", "in_progress", "completed")
+)
+VALID_PRIORITIES = frozenset((1, 2, 3))
 
 
 class TaskManager:
@@ -19,28 +27,72 @@ class TaskManager:
             
         self.file_path = file_path
         self.notes_file_path = notes_file_path
-        self.tasks = self._load_tasks()
-        self.notes = self._load_notes()
+        
+        # Tasks and notes are loaded from disk on first access
+        self._tasks = []
+        self._by_id = {}
+        self._loaded = False
+        self._notes = None
+        
+        # Write-back state: with autosave off, mutations only mark the
+        # tasks dirty and are written out by flush()
+        self._dirty = False
+        self._autosave = True
+        
+        # Bumped whenever the tasks or notes are loaded or changed, so
+        # readers can cheaply tell whether they need to redraw
+        self.version = 0
+        self.notes_version = 0
     
     def _load_tasks(self):
         """Load tasks from the file or return an empty list if file doesn't exist."""
         if os.path.exists(self.file_path):
             try:
-                with open(self.file_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
+                return storage.read_json(self.file_path)
+            except storage.JSONDecodeError:
                 return []
         return []
         
     def reload_tasks(self):
         """Reload tasks from file (for external changes like MCP)."""
-        self.tasks = self._load_tasks()
+        # Drop the cached tasks; they are re-read on next access
+        self._tasks = []
+        self._by_id = {}
+        self._loaded = False
+    
+    @property
+    def tasks(self):
+        """The task list, loaded from the file on first access."""
+        if not self._loaded:
+            self.set_tasks(self._load_tasks())
+        return self._tasks
+    
+    @tasks.setter
+    def tasks(self, tasks):
+        self.set_tasks(tasks)
+    
+    def set_tasks(self, tasks):
+        """Replace all tasks and rebuild the ID index."""
+        # Validate and index in a single pass, dropping malformed records
+        valid = []
+        by_id = {}
+        if isinstance(tasks, list):
+            for task in tasks:
+                # IDs are strings; anything else can't be looked up (or,
+                # for lists and dicts, even indexed)
+                if isinstance(task, dict) and isinstance(task.get("id"), str):
+                    valid.append(task)
+                    by_id[task["id"]] = task
+        self._tasks = valid
+        self._by_id = by_id
+        self._loaded = True
+        self.version += 1
     
     def _load_notes(self):
         """Load notes from file or return empty string if file doesn't exist."""
         if os.path.exists(self.notes_file_path):
             try:
-                with open(self.notes_file_path, 'r') as f:
+                with open(self.notes_file_path, 'r', encoding="utf-8") as f:
                     return f.read()
             except:
                 return ""
@@ -48,18 +100,46 @@ class TaskManager:
         
     def reload_notes(self):
         """Reload notes from file (for external changes like MCP)."""
-        self.notes = self._load_notes()
+        # Drop the cached notes; they are re-read on next access
+        self._notes = None
+    
+    @property
+    def notes(self):
+        """The notes text, loaded from the file on first access."""
+        if self._notes is None:
+            self._notes = self._load_notes()
+            self.notes_version += 1
+        return self._notes
+    
+    @notes.setter
+    def notes(self, notes_text):
+        self._notes = notes_text
+        self.notes_version += 1
     
     def save_tasks(self):
         """Save tasks to the file."""
-        with open(self.file_path, 'w') as f:
-            json.dump(self.tasks, f, indent=2)
+        storage.write_json(self.file_path, self.tasks)
+        self._dirty = False
+    
+    def _mark_dirty(self):
+        """Record a mutation, saving immediately if autosave is enabled."""
+        self.version += 1
+        if self._autosave:
+            self.save_tasks()
+        else:
+            self._dirty = True
+    
+    def flush(self):
+        """Save tasks only if there are unsaved changes."""
+        if self._dirty:
+            self.save_tasks()
+            return True
+        return False
             
     def save_notes(self, notes_text):
         """Save notes to the file."""
         self.notes = notes_text
-        with open(self.notes_file_path, 'w') as f:
-            f.write(notes_text)
+        storage.atomic_write(self.notes_file_path, notes_text.encode("utf-8"))
             
     def get_notes(self):
         """Get the current notes."""
@@ -71,48 +151,77 @@ class TaskManager:
     
     def get_task(self, task_id):
         """Get a task by ID."""
-        for task in self.tasks:
-            if task["id"] == task_id:
-                return task
-        return None
+        if not self._loaded:
+            self.set_tasks(self._load_tasks())
+        return self._by_id.get(task_id)
     
     def add_task(self, title, description="", priority=1, status="not_started"):
         """Add a new task."""
-        # Validate status
-        valid_statuses = ["not_started", "in_progress", "completed"]
-        if status not in valid_statuses:
+        # Validate status and priority
+        if status in VALID_STATUSES:
+            status = sys.intern(status)
+        else:
             status = "not_started"
+        if priority not in VALID_PRIORITIES:
+            priority = 1
             
+        now = storage.now_iso()
         task = {
-            "id": str(uuid.uuid4()),
+            "id": uuid4().hex,
             "title": title,
             "description": description,
             "priority": priority,
             "status": status,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
         self.tasks.append(task)
-        self.save_tasks()
+        self._by_id[task["id"]] = task
+        self._mark_dirty()
         return task
     
-    def update_task(self, task_id, **kwargs):
-        """Update a task by ID."""
+    def update_task(self, task_id, title=None, description=None, priority=None,
+                    status=None):
+        """Update a task by ID; fields left as None are not changed."""
         task = self.get_task(task_id)
         if task:
-            for key, value in kwargs.items():
-                if key in task and key not in ["id", "created_at"]:
-                    task[key] = value
-            task["updated_at"] = datetime.now().isoformat()
-            self.save_tasks()
+            changed = False
+            if title is not None and task.get("title") != title:
+                task["title"] = title
+                changed = True
+            if description is not None and task.get("description") != description:
+                task["description"] = description
+                changed = True
+            if priority is not None and task.get("priority") != priority:
+                task["priority"] = priority
+                changed = True
+            if status is not None and task.get("status") != status:
+                task["status"] = status
+                changed = True
+            
+            # Leave the file alone if nothing actually changed
+            if changed:
+                task["updated_at"] = storage.now_iso()
+                self._mark_dirty()
             return task
         return None
     
     def delete_task(self, task_id):
         """Delete a task by ID."""
-        task = self.get_task(task_id)
-        if task:
-            self.tasks.remove(task)
-            self.save_tasks()
+        idx = self._find_index(task_id)
+        if idx >= 0:
+            self.tasks.pop(idx)
+            del self._by_id[task_id]
+            self._mark_dirty()
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def _find_index(self, task_id):
+        """Return the list position of a task, or -1 if it doesn't exist."""
+        task = self.get_task(task_id)
+        if task is None:
+            return -1
+        for i, candidate in enumerate(self.tasks):
+            if candidate is task:
+                return i
+        return -1
\ No newline at end of file
@@ -0,0 +1,91 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+# struct inotify_event header: wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class FileWatcher:
+    """
+    Watch a set of files for changes using Linux inotify.
+
+    The parent directories are watched rather than the files themselves:
+    data files are saved by writing a temporary file and renaming it over
+    the original, which would silently drop a watch on the old inode.
+    """
+
+    def __init__(self, paths):
+        """Start watching the given file paths."""
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        # Watch descriptor -> {file name: full path} for the watched files
+        self._watched = {}
+        try:
+            for path in paths:
+                directory, name = os.path.split(os.path.abspath(path))
+                wd = libc.inotify_add_watch(
+                    self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO
+                )
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno), directory)
+                self._watched.setdefault(wd, {})[os.fsencode(name)] = path
+        except OSError:
+            self.close()
+            raise
+
+    def fileno(self):
+        """Return the inotify file descriptor, for use with select()."""
+        return self._fd
+
+    def read_changes(self):
+        """Drain pending events and return the set of watched paths that changed."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+
+                path = self._watched.get(wd, {}).get(name)
+                if path is not None:
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        """Stop watching and release the inotify descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_file_watcher(paths):
+    """Return a FileWatcher for paths, or None if inotify isn't available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return FileWatcher(paths)
+    except (OSError, AttributeError):
+        # AttributeError: libc without inotify symbols
+        return None
@@ -1,6 +1,8 @@
 import curses
 from enum import Enum
 
+from app.core.task_manager import VALID_STATUSES
+
 class FocusArea(Enum):
     TASKS = 0
     DETAILS = 1
@@ -8,11 +10,77 @@ class FocusArea(Enum):
     NOTES = 3
 
 
+# Tab order with and without the notes pane
+_CYCLE_WITH_NOTES = (
+    FocusArea.TASKS, FocusArea.DETAILS, FocusArea.PLAN, FocusArea.NOTES
+)
+_CYCLE_WITHOUT_NOTES = (FocusArea.TASKS, FocusArea.DETAILS, FocusArea.PLAN)
+
+# Next focus area keyed by (notes_visible, current focus)
+_NEXT_FOCUS = {
+    (notes_visible, focus): cycle[(i + 1) % len(cycle)]
+    for notes_visible, cycle in (
+        (True, _CYCLE_WITH_NOTES), (False, _CYCLE_WITHOUT_NOTES)
+    )
+    for i, focus in enumerate(cycle)
+}
+# Focus can't normally stay on hidden notes, but recover if it does
+_NEXT_FOCUS[(False, FocusArea.NOTES)] = FocusArea.TASKS
+
+# Task status cycle; the old "pending" status is treated as "not_started"
+_STATUS_NEXT = {
+    "pending": "in_progress",
+    "not_started": "in_progress",
+    "in_progress": "completed",
+    "completed": "not_started"
+}
+
+
 class InputHandler:
     def __init__(self, terminal_ui):
         """Initialize the input handler with a reference to the terminal UI."""
         self.terminal_ui = terminal_ui
         self.focus = FocusArea.TASKS
+        
+        # Key code -> handler tables, built once so dispatch is a dict lookup.
+        # Global handlers return False to exit; the others return nothing.
+        enter_keys = (10, 13, curses.KEY_ENTER)  # Enter (different codes)
+        
+        self._global_keymap = {
+            27: self._handle_escape,  # Escape
+            9: self._handle_tab,  # Tab
+            24: self._handle_toggle_notes,  # Ctrl+X (ASCII 24)
+        }
+        
+        self._tasks_keymap = {
+            curses.KEY_UP: self._tasks_up,
+            curses.KEY_DOWN: self._tasks_down,
+            ord(' '): self._tasks_toggle,  # Toggle completion status
+            ord('n'): self._new_task,  # New task
+            ord('e'): self._edit_task,  # Edit task
+            ord('d'): self._delete_task,  # Delete task
+        }
+        self._tasks_keymap.update(dict.fromkeys(enter_keys, self._tasks_toggle))
+        
+        self._plan_keymap = {
+            curses.KEY_UP: self._plan_up,
+            curses.KEY_DOWN: self._plan_down,
+            ord(' '): self._toggle_plan_step,  # Toggle completion
+            ord('d'): self._plan_toggle_details,  # Toggle details view
+            ord('n'): self._new_plan_step,  # New plan step
+            ord('e'): self._edit_plan_step,  # Edit plan step
+            # Delete plan step (capital D to avoid conflict with details)
+            ord('D'): self._delete_plan_step,
+        }
+        self._plan_keymap.update(dict.fromkeys(enter_keys, self._toggle_plan_step))
+        
+        # Focus-specific handlers indexed by FocusArea value
+        self._focus_handlers = (
+            self._handle_tasks_input,
+            self._handle_details_input,
+            self._handle_plan_input,
+            self._handle_notes_input,
+        )
     
     def handle_input(self, key):
         """
@@ -20,42 +88,26 @@ class InputHandler:
         Returns True if the application should continue, False if it should exit.
         """
         # If notes is in edit mode, we need special handling
-        if self.focus == FocusArea.NOTES and self.terminal_ui.notes_win.edit_mode:
+        notes_win = self.terminal_ui.notes_win
+        if self.focus == FocusArea.NOTES and notes_win.edit_mode:
             # Escape exits edit mode in notes
             if key == 27:  # Escape
-                self.terminal_ui.notes_win.toggle_edit_mode()
+                notes_win.toggle_edit_mode()
                 self.terminal_ui.save_notes()
                 return True
             
-            # All other keys are processed by the notes window
-            try:
-                self.terminal_ui.notes_win.handle_key(key)
-                return True
-            except Exception as e:
-                self.terminal_ui.show_message(f"Error in notes edit: {str(e)}")
-                return True
+            # All other keys are processed by the notes window, which
+            # handles its own drawing errors
+            notes_win.handle_key(key)
+            return True
         
         # Global keys (work in any context)
-        if key == 27:  # Escape
-            return self._handle_escape()
-        elif key == 9:  # Tab
-            self._cycle_focus()
-            return True
-        elif key == 24:  # Ctrl+X - toggle notes visibility (ASCII 24 is Ctrl+X)
-            self.terminal_ui.toggle_notes_visibility()
-            return True
+        handler = self._global_keymap.get(key)
+        if handler is not None:
+            return handler()
         
         # Focus-specific input handling
-        if self.focus == FocusArea.TASKS:
-            return self._handle_tasks_input(key)
-        elif self.focus == FocusArea.DETAILS:
-            return self._handle_details_input(key)
-        elif self.focus == FocusArea.PLAN:
-            return self._handle_plan_input(key)
-        elif self.focus == FocusArea.NOTES:
-            return self._handle_notes_input(key)
-        
-        return True
+        return self._focus_handlers[self.focus.value](key)
     
     def _handle_escape(self):
         """Handle the escape key - confirm exit."""
@@ -68,57 +120,46 @@ class InputHandler:
         )
         return not confirm  # Return False to exit if confirmed
     
+    def _handle_tab(self):
+        """Handle the tab key - move focus to the next area."""
+        self._cycle_focus()
+        return True
+    
+    def _handle_toggle_notes(self):
+        """Handle Ctrl+X - toggle notes visibility."""
+        self.terminal_ui.toggle_notes_visibility()
+        return True
+    
     def _cycle_focus(self):
         """Cycle through the focus areas."""
-        focus_order = list(FocusArea)
-        current_idx = focus_order.index(self.focus)
+        # Notes are skipped when hidden
+        self.focus = _NEXT_FOCUS[(self.terminal_ui.notes_visible, self.focus)]
         
-        # Skip Notes focus if it's not visible
-        if not self.terminal_ui.notes_visible:
-            # Create a filtered list without the NOTES enum
-            focus_order = [f for f in focus_order if f != FocusArea.NOTES]
-        
-        # Find the next focus in our (potentially filtered) list
-        next_idx = (focus_order.index(self.focus) + 1) % len(focus_order)
-        self.focus = focus_order[next_idx]
-        
-        # Update UI with new focus
+        # Update UI with new focus (this repaints the changed titles)
         self.terminal_ui.update_focus(self.focus)
-        
-        # Force a complete UI redraw to fix rendering artifacts
-        self.terminal_ui._resize_layout()
     
     def _handle_tasks_input(self, key):
         """Handle input while focused on the task list."""
-        if key == curses.KEY_UP:
-            self.terminal_ui.task_list_win.select_prev()
-            self._update_task_details()
-        
-        elif key == curses.KEY_DOWN:
-            self.terminal_ui.task_list_win.select_next()
-            self._update_task_details()
-        
-        elif key in (10, 13, curses.KEY_ENTER):  # Enter (different codes)
-            # Toggle completion status when Enter is pressed
-            self._toggle_selected_task()
-            self._update_task_details()
-        
-        elif key == ord(' '):  # Space 
-            # Toggle completion status when Space is pressed
-            self._toggle_selected_task()
-            self._update_task_details()
-        
-        elif key == ord('n'):  # New task
-            self._new_task()
-        
-        elif key == ord('e'):  # Edit task
-            self._edit_task()
-        
-        elif key == ord('d'):  # Delete task
-            self._delete_task()
-        
+        handler = self._tasks_keymap.get(key)
+        if handler is not None:
+            handler()
         return True
     
+    def _tasks_up(self):
+        """Select the previous task."""
+        self.terminal_ui.task_list_win.select_prev()
+        self._update_task_details()
+    
+    def _tasks_down(self):
+        """Select the next task."""
+        self.terminal_ui.task_list_win.select_next()
+        self._update_task_details()
+    
+    def _tasks_toggle(self):
+        """Cycle the status of the selected task."""
+        self._toggle_selected_task()
+        self._update_task_details()
+    
     def _handle_details_input(self, key):
         """Handle input while focused on the task details."""
         # There's not much to do in the details view except view
@@ -135,37 +176,27 @@ class InputHandler:
     
     def _handle_plan_input(self, key):
         """Handle input while focused on the project plan."""
-        if key == curses.KEY_UP:
-            self.terminal_ui.plan_win.select_prev()
-        
-        elif key == curses.KEY_DOWN:
-            self.terminal_ui.plan_win.select_next()
-        
-        elif key in (10, 13, curses.KEY_ENTER):  # Enter (different codes)
-            # Toggle completion when Enter is pressed
-            self._toggle_plan_step()
-        
-        elif key == ord(' '):  # Toggle completion with Space
-            self._toggle_plan_step()
-        
-        elif key == ord('d'):  # Toggle details view
-            self.terminal_ui.plan_win.toggle_details()
-        
-        elif key == ord('n'):  # New plan step
-            self._new_plan_step()
-        
-        elif key == ord('e'):  # Edit plan step
-            self._edit_plan_step()
-        
-        elif key == ord('D'):  # Delete plan step (capital D to avoid conflict with details)
-            self._delete_plan_step()
-        
+        handler = self._plan_keymap.get(key)
+        if handler is not None:
+            handler()
         return True
     
+    def _plan_up(self):
+        """Select the previous plan step."""
+        self.terminal_ui.plan_win.select_prev()
+    
+    def _plan_down(self):
+        """Select the next plan step."""
+        self.terminal_ui.plan_win.select_next()
+    
+    def _plan_toggle_details(self):
+        """Show or hide the details of the selected plan step."""
+        self.terminal_ui.plan_win.toggle_details()
+    
     def _update_task_details(self):
         """Update the task details window with the selected task."""
-        task = self.terminal_ui.task_list_win.get_selected_task()
-        self.terminal_ui.task_detail_win.set_task(task)
+        ui = self.terminal_ui
+        ui.task_detail_win.set_task(ui.task_list_win.get_selected_task())
     
     def _new_task(self):
         """Create a new task."""
@@ -175,29 +206,25 @@ class InputHandler:
         if values:
             title, description, priority_str = values
             
-            # Validate priority
-            try:
-                priority = int(priority_str) if priority_str else 1
-                if priority < 1 or priority > 3:
-                    priority = 1
-            except ValueError:
-                priority = 1
+            # Validate priority, clamping it into the 1-3 range
+            priority = 1
+            if priority_str.isdecimal():
+                priority = min(3, max(1, int(priority_str)))
             
             # Add the task
             task = self.terminal_ui.api.add_task(title, description, priority)
             
-            # Refresh task list
+            # Refresh task list, sorting the new task into place
+            self.terminal_ui._sort_dirty = True
             self.terminal_ui.refresh_tasks()
             
             # Find and select the new task
-            tasks = self.terminal_ui.api.get_all_tasks()
-            for i, t in enumerate(tasks):
-                if t["id"] == task["id"]:
-                    self.terminal_ui.task_list_win.selected_index = i
-                    self.terminal_ui.task_list_win.adjust_selection()
-                    self.terminal_ui.task_list_win.refresh_content()
-                    self._update_task_details()
-                    break
+            idx = self.terminal_ui._id_to_index.get(task["id"])
+            if idx is not None:
+                self.terminal_ui.task_list_win.selected_index = idx
+                self.terminal_ui.task_list_win.adjust_selection()
+                self.terminal_ui.task_list_win.refresh_content()
+                self._update_task_details()
     
     def _edit_task(self):
         """Edit the selected task."""
@@ -219,19 +246,19 @@ class InputHandler:
         if new_values:
             title, description, priority_str, status = new_values
             
-            # Validate priority
-            try:
-                priority = int(priority_str) if priority_str else task["priority"]
-                if priority < 1 or priority > 3:
-                    priority = task["priority"]
-            except ValueError:
-                priority = task["priority"]
+            # Validate priority, clamping it into the 1-3 range
+            priority = task["priority"]
+            if priority_str.isdecimal():
+                priority = min(3, max(1, int(priority_str)))
             
             # Validate status
-            valid_statuses = ["not_started", "in_progress", "completed"]
-            if status not in valid_statuses:
+            if status not in VALID_STATUSES:
                 status = task["status"]
             
+            # Changing either sort key moves the task in the list
+            if priority != task["priority"] or status != task["status"]:
+                self.terminal_ui._sort_dirty = True
+            
             # Update the task
             self.terminal_ui.api.update_task(
                 task["id"],
@@ -287,13 +314,11 @@ class InputHandler:
                 
                 # Only try to find and select the new step if it was successfully created
                 if step and isinstance(step, dict) and "id" in step:
-                    steps = self.terminal_ui.api.get_all_plan_steps()
-                    for i, s in enumerate(steps):
-                        if s["id"] == step["id"]:
-                            self.terminal_ui.plan_win.selected_index = i
-                            self.terminal_ui.plan_win.adjust_selection()
-                            self.terminal_ui.plan_win.refresh_content()
-                            break
+                    idx = self.terminal_ui._step_id_to_index.get(step["id"])
+                    if idx is not None:
+                        self.terminal_ui.plan_win.selected_index = idx
+                        self.terminal_ui.plan_win.adjust_selection()
+                        self.terminal_ui.plan_win.refresh_content()
         except Exception as e:
             self.terminal_ui.show_message(f"Error creating plan step: {str(e)}")
     
@@ -322,12 +347,7 @@ class InputHandler:
             order_str = new_values[3] if len(new_values) > 3 else ""
             
             # Validate order
-            try:
-                order = int(order_str) if order_str else step.get("order", 0)
-                if order < 0:
-                    order = step.get("order", 0)
-            except ValueError:
-                order = step.get("order", 0)
+            order = int(order_str) if order_str.isdecimal() else step.get("order", 0)
             
             # Update the plan step
             self.terminal_ui.api.update_plan_step(
@@ -361,42 +381,40 @@ class InputHandler:
     
     def _toggle_selected_task(self):
         """Cycle through task statuses (not_started -> in_progress -> completed -> not_started)."""
-        task = self.terminal_ui.task_list_win.get_selected_task()
+        ui = self.terminal_ui
+        task_list_win = ui.task_list_win
+        task = task_list_win.get_selected_task()
         if not task:
             return
         
         # Cycle through the statuses
-        current_status = task.get("status", "not_started")
-        
-        # If it's an old "pending" status, treat it as "not_started"
-        if current_status == "pending":
-            current_status = "not_started"
-            
-        status_cycle = {
-            "not_started": "in_progress",
-            "in_progress": "completed",
-            "completed": "not_started"
-        }
-        
-        new_status = status_cycle.get(current_status, "not_started")
+        new_status = _STATUS_NEXT.get(task.get("status", "not_started"), "not_started")
         
         # Update the task
-        self.terminal_ui.api.update_task(
+        updated = ui.api.update_task(
             task["id"],
             status=new_status
         )
         
-        # Refresh task list
-        self.terminal_ui.refresh_tasks()
+        ui._sort_dirty = True
+        if updated is task:
+            # The displayed task dict was updated in place, so only its row
+            # needs redrawing. The task keeps its position until the next
+            # refresh re-sorts the list, so repeated toggles stay on it.
+            task_list_win.refresh_task_row(task_list_win.selected_index)
+        else:
+            # The tasks were reloaded since they were displayed
+            ui.refresh_tasks()
     
     def _toggle_plan_step(self):
         """Toggle the completion status of the selected plan step."""
-        step = self.terminal_ui.plan_win.get_selected_step()
+        ui = self.terminal_ui
+        step = ui.plan_win.get_selected_step()
         if not step:
             return
         
         # Toggle the plan step
-        self.terminal_ui.api.toggle_plan_step(step["id"])
+        ui.api.toggle_plan_step(step["id"])
         
         # Refresh plan
-        self.terminal_ui.refresh_plan()
\ No newline at end of file
+        ui.refresh_plan()
\ No newline at end of file
@@ -1,16 +1,34 @@
 import curses
-import traceback
 import os
+import select
+import sys
 import time
 
-from app.ui.ui_components import TaskListWindow, TaskDetailWindow, PlanWindow, NotesWindow, InputDialog, ConfirmDialog
+from app.ui.ui_components import (
+    Window, TaskListWindow, TaskDetailWindow, PlanWindow, NotesWindow,
+    InputDialog, ConfirmDialog
+)
 from app.ui.input_handler import InputHandler, FocusArea
+from app.ui.file_watcher import create_file_watcher
+
+
+def _mtime_ns(path):
+    """Return a file's modification time in nanoseconds, or 0 if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
 
 
 class TerminalUI:
     def __init__(self, api):
         """Initialize the terminal UI with a reference to the API."""
         self.api = api
+        
+        # Data file paths, looked up once for the change checks
+        self._task_file = api.task_manager.file_path
+        self._plan_file = api.plan_manager.file_path
+        self._notes_file = api.task_manager.notes_file_path
         self.stdscr = None
         self.task_list_win = None
         self.task_detail_win = None
@@ -19,12 +37,31 @@ class TerminalUI:
         self.input_handler = None
         self.notes_visible = True  # Flag to control notes visibility
         
+        # ID -> row position of the displayed tasks and plan steps
+        self._id_to_index = {}
+        self._step_id_to_index = {}
+        
+        # Set when a task's sort key changed in place and the displayed
+        # list has to be re-sorted on its next refresh
+        self._sort_dirty = False
+        
+        # Manager data versions last drawn, to skip redrawing unchanged data
+        self._tasks_version = None
+        self._plan_version = None
+        self._notes_version = None
+        
         # File modification tracking
-        self.last_tasks_mtime = 0
-        self.last_plan_mtime = 0
-        self.last_notes_mtime = 0
+        self.last_tasks_mtime_ns = 0
+        self.last_plan_mtime_ns = 0
+        self.last_notes_mtime_ns = 0
         self.last_check_time = 0
         self.file_check_interval = 1.0  # Check for file changes every second
+        self.reload_debounce = 0.25  # Coalesce bursts of external writes
+        
+        # Edits are saved once they have been quiet for write_delay seconds
+        # rather than on every keystroke
+        self.write_delay = 0.1
+        self._write_due = None  # Deadline for saving pending edits
     
     def run(self):
         """Run the terminal UI."""
@@ -38,6 +75,8 @@ class TerminalUI:
                 self.stdscr.timeout(-1)
                 curses.endwin()
             print(f"An error occurred: {str(e)}")
+            # Only needed on this error path, so imported here
+            import traceback
             traceback.print_exc()
     
     def _main(self, stdscr):
@@ -51,6 +90,9 @@ class TerminalUI:
         # Set up input handler
         self.input_handler = InputHandler(self)
         
+        # Keep edits in memory and save them in batches (see _flush_writes)
+        self.api.set_autosave(False)
+        
         # Create initial layout
         self._create_layout()
         
@@ -61,45 +103,125 @@ class TerminalUI:
             self.refresh_notes()
             
             # Initialize last modified times after initial load
-            task_file = self.api.task_manager.file_path
-            plan_file = self.api.plan_manager.file_path
-            notes_file = self.api.task_manager.notes_file_path
-            
-            if os.path.exists(task_file):
-                self.last_tasks_mtime = os.path.getmtime(task_file)
-            if os.path.exists(plan_file):
-                self.last_plan_mtime = os.path.getmtime(plan_file)
-            if os.path.exists(notes_file):
-                self.last_notes_mtime = os.path.getmtime(notes_file)
+            self.last_tasks_mtime_ns = _mtime_ns(self._task_file)
+            self.last_plan_mtime_ns = _mtime_ns(self._plan_file)
+            self.last_notes_mtime_ns = _mtime_ns(self._notes_file)
                 
-            self.last_check_time = time.time()
+            self.last_check_time = time.monotonic()
             
         except Exception as e:
             self.show_message(f"Error loading data: {str(e)}")
         
-        # Main event loop
+        # Watch the data files with inotify where available so the loop can
+        # sleep until there is real work; otherwise fall back to polling
+        watcher = create_file_watcher(
+            [self._task_file, self._plan_file, self._notes_file]
+        )
+        try:
+            if watcher is not None:
+                self._watch_loop(stdscr, watcher)
+            else:
+                self._poll_loop(stdscr)
+        finally:
+            if watcher is not None:
+                watcher.close()
+            # Save anything still pending on the way out
+            self.api.set_autosave(True)
+    
+    def _poll_loop(self, stdscr):
+        """Event loop that polls the data files for changes between keys."""
+        stdin_fd = sys.stdin.fileno()
+        
         while True:
+            # Write everything staged while handling the last event
+            Window.commit()
+            
+            # Sleep until a key arrives or the next file check or save is due
+            now = time.monotonic()
+            next_check = self.last_check_time + self.file_check_interval
+            if self._write_due is not None:
+                next_check = min(next_check, self._write_due)
+            timeout = max(0, next_check - now)
+            ready, _, _ = select.select([stdin_fd], [], [], timeout)
+            
+            # Save edits that have been quiet long enough
+            if self._write_due is not None and time.monotonic() >= self._write_due:
+                self._flush_writes()
+            
             # Check for external file changes (e.g., from MCP)
             self.check_file_changes()
             
-            # Update the screen
-            stdscr.refresh()
+            if ready and not self._handle_pending_keys(stdscr):
+                return
+    
+    def _watch_loop(self, stdscr, watcher):
+        """Event loop that blocks until a key arrives or a data file changes."""
+        stdin_fd = sys.stdin.fileno()
+        watcher_fd = watcher.fileno()
+        reload_due = None  # Deadline for a pending, debounced reload
+        
+        while True:
+            # Write everything staged while handling the last event
+            Window.commit()
             
-            # Configure timeout for getch to allow polling for file changes
-            stdscr.timeout(100)  # 100ms timeout
+            # Sleep indefinitely unless a debounced reload or save is pending
+            deadlines = [
+                due for due in (reload_due, self._write_due) if due is not None
+            ]
+            timeout = None
+            if deadlines:
+                timeout = max(0, min(deadlines) - time.monotonic())
+            ready, _, _ = select.select([stdin_fd, watcher_fd], [], [], timeout)
             
-            # Get input (returns -1 if no input available)
-            key = stdscr.getch()
+            if self._write_due is not None and time.monotonic() >= self._write_due:
+                self._flush_writes()
             
-            # Reset timeout to blocking mode if we actually got a key
-            if key != -1:
-                stdscr.timeout(-1)
-                # Handle input (exit if handler returns False)
-                if not self.input_handler.handle_input(key):
-                    break
-            else:
-                # No input, just continue the loop to check for file changes
-                continue
+            if watcher_fd in ready and watcher.read_changes() and reload_due is None:
+                reload_due = time.monotonic() + self.reload_debounce
+            
+            if reload_due is not None and time.monotonic() >= reload_due:
+                reload_due = None
+                self._reload_changed_files()
+            
+            if stdin_fd in ready and not self._handle_pending_keys(stdscr):
+                return
+    
+    def _handle_pending_keys(self, stdscr):
+        """
+        Handle every key curses has buffered, not just the first.
+        Returns False if the application should exit.
+        """
+        # Reads are non-blocking here, but handlers (dialogs, messages)
+        # expect blocking reads
+        while True:
+            stdscr.timeout(0)
+            key = stdscr.getch()
+            stdscr.timeout(-1)
+            if key == -1:
+                break
+            # Handle input (exit if handler returns False)
+            if not self.input_handler.handle_input(key):
+                return False
+        self._schedule_write()
+        return True
+    
+    def _schedule_write(self):
+        """Push back the save deadline if there are unsaved edits."""
+        if self.api.has_unsaved_changes():
+            self._write_due = time.monotonic() + self.write_delay
+    
+    def _flush_writes(self):
+        """
+        Save pending edits and record the new file modification times.
+        
+        Recording the times means the file watcher's events for our own
+        writes don't trigger a reload.
+        """
+        self._write_due = None
+        if self.api.task_manager.flush():
+            self.last_tasks_mtime_ns = _mtime_ns(self._task_file)
+        if self.api.plan_manager.flush():
+            self.last_plan_mtime_ns = _mtime_ns(self._plan_file)
     
     def _create_layout(self):
         """Create the initial window layout."""
@@ -157,9 +279,9 @@ class TerminalUI:
             self.task_detail_win.refresh_content()
             self.plan_win.refresh_content()
             
-            # Refresh the stdscr to ensure proper redraw of everything
-            self.stdscr.refresh()
-            
+            # Stage the stdscr to ensure proper redraw of everything
+            self.stdscr.noutrefresh()
+        
         return self.notes_visible
     
     def _resize_layout(self):
@@ -201,8 +323,20 @@ class TerminalUI:
         """Refresh task list and details."""
         tasks = self.api.get_all_tasks()
         
-        # Sort tasks by priority (high to low) and then by status
-        tasks.sort(key=lambda x: (-x['priority'], x['status']))
+        # Nothing to do if the tasks haven't changed since they were drawn
+        # and no re-sort is pending
+        version = self.api.task_manager.version
+        if version == self._tasks_version and not self._sort_dirty:
+            return
+        self._tasks_version = version
+        
+        # Sort tasks by priority (high to low) and then by status. The list
+        # is sorted in place, so it only needs sorting again when it was
+        # reloaded or a sort key changed.
+        if self._sort_dirty or tasks is not self.task_list_win.tasks:
+            tasks.sort(key=lambda x: (-x['priority'], x['status']))
+            self._sort_dirty = False
+        self._id_to_index = {task['id']: i for i, task in enumerate(tasks)}
         
         self.task_list_win.set_tasks(tasks)
         
@@ -218,54 +352,75 @@ class TerminalUI:
             # Validate steps before setting them
             if steps is None:
                 steps = []
+            
+            # Nothing to do if the plan hasn't changed since it was drawn
+            version = self.api.plan_manager.version
+            if version == self._plan_version:
+                return
+            self._plan_version = version
                 
             # Steps are already sorted by order in the API
+            self._step_id_to_index = {step['id']: i for i, step in enumerate(steps)}
             self.plan_win.set_steps(steps)
         except Exception as e:
             # Handle errors gracefully
+            self._step_id_to_index = {}
+            self._plan_version = None
             self.plan_win.set_steps([])
             raise Exception(f"Failed to load plan: {str(e)}")
     
     def refresh_notes(self):
         """Load and refresh the notes content."""
         notes = self.api.get_notes()
+        
+        # Nothing to do if the notes haven't changed since they were drawn
+        version = self.api.task_manager.notes_version
+        if version == self._notes_version:
+            return
+        self._notes_version = version
         self.notes_win.set_notes(notes)
     
     def save_notes(self):
         """Save the current notes content."""
         notes_text = self.notes_win.get_notes()
         self.api.save_notes(notes_text)
+        self.last_notes_mtime_ns = _mtime_ns(self._notes_file)
         
     def check_file_changes(self):
         """Check if any data files have been modified externally (like by MCP)."""
-        try:
-            current_time = time.time()
+        # Only check periodically to reduce file system access. The
+        # monotonic clock can't be thrown off by wall-clock adjustments.
+        current_time = time.monotonic()
+        if current_time - self.last_check_time < self.file_check_interval:
+            return False
             
-            # Only check periodically to reduce file system access
-            if current_time - self.last_check_time < self.file_check_interval:
-                return False
-                
-            self.last_check_time = current_time
+        self.last_check_time = current_time
+        return self._reload_changed_files()
+    
+    def _reload_changed_files(self):
+        """Reload and redraw the data files whose modification time changed."""
+        try:
             changes_detected = False
             
-            # Get file paths from the API's managers
-            task_file = self.api.task_manager.file_path
-            plan_file = self.api.plan_manager.file_path
-            notes_file = self.api.task_manager.notes_file_path
+            # Save pending edits first; reloading would discard them
+            self._flush_writes()
             
-            # Check if any data files have been modified
-            tasks_changed = os.path.exists(task_file) and os.path.getmtime(task_file) > self.last_tasks_mtime
-            plan_changed = os.path.exists(plan_file) and os.path.getmtime(plan_file) > self.last_plan_mtime
-            notes_changed = os.path.exists(notes_file) and os.path.getmtime(notes_file) > self.last_notes_mtime
+            # Check if any data files have been modified (one stat per file)
+            tasks_mtime_ns = _mtime_ns(self._task_file)
+            plan_mtime_ns = _mtime_ns(self._plan_file)
+            notes_mtime_ns = _mtime_ns(self._notes_file)
+            tasks_changed = tasks_mtime_ns > self.last_tasks_mtime_ns
+            plan_changed = plan_mtime_ns > self.last_plan_mtime_ns
+            notes_changed = notes_mtime_ns > self.last_notes_mtime_ns
             
             if tasks_changed or plan_changed or notes_changed:
                 # Update last modified times
                 if tasks_changed:
-                    self.last_tasks_mtime = os.path.getmtime(task_file)
+                    self.last_tasks_mtime_ns = tasks_mtime_ns
                 if plan_changed:
-                    self.last_plan_mtime = os.path.getmtime(plan_file)
+                    self.last_plan_mtime_ns = plan_mtime_ns
                 if notes_changed:
-                    self.last_notes_mtime = os.path.getmtime(notes_file)
+                    self.last_notes_mtime_ns = notes_mtime_ns
                 
                 try:
                     # Reload all data from files
@@ -305,45 +460,41 @@ class TerminalUI:
     
     def update_focus(self, focus):
         """Update the UI focus."""
-        # Reset all titles first
-        self.task_list_win.set_title("Tasks")
-        self.task_detail_win.set_title("Task Details")
-        self.plan_win.set_title("Project Plan")
+        # Only the title bars change with focus, so leave the content alone
+        self._repaint_titles(focus)
+    
+    def _repaint_titles(self, focus):
+        """Repaint the title of each window whose active marker changed."""
+        windows = [
+            (self.task_list_win, "Tasks", FocusArea.TASKS),
+            (self.task_detail_win, "Task Details", FocusArea.DETAILS),
+            (self.plan_win, "Project Plan", FocusArea.PLAN),
+        ]
         if self.notes_visible:
-            self.notes_win.set_title("Notes")
+            windows.append((self.notes_win, "Notes", FocusArea.NOTES))
         
         # Highlight the active window by changing its title
-        if focus == FocusArea.TASKS:
-            self.task_list_win.set_title("Tasks [Active]")
-        elif focus == FocusArea.DETAILS:
-            self.task_detail_win.set_title("Task Details [Active]")
-        elif focus == FocusArea.PLAN:
-            self.plan_win.set_title("Project Plan [Active]")
-        elif focus == FocusArea.NOTES and self.notes_visible:
-            self.notes_win.set_title("Notes [Active]")
-        
-        # Clear screen to remove artifacts
-        self.stdscr.erase()
-        self.stdscr.refresh()
-        
-        # Refresh the content of all windows
-        self.task_list_win.refresh_content()
-        self.task_detail_win.refresh_content()
-        self.plan_win.refresh_content()
-        
-        # Only refresh notes if visible
-        if self.notes_visible:
-            self.notes_win.refresh_content()
+        for window, title, area in windows:
+            if area == focus:
+                title += " [Active]"
+            if window.title != title:
+                window.repaint_title(title)
+                window.win.noutrefresh()
+    
+    def _full_redraw(self):
+        """Clear the screen and redraw every window, e.g. after a dialog closes."""
+        self.stdscr.clear()
+        self.stdscr.noutrefresh()
+        self._resize_layout()
     
     def show_input_dialog(self, title, prompts, initial_values=None):
         """Show an input dialog and return the entered values or None if canceled."""
         dialog = InputDialog(self.stdscr, title, prompts, initial_values)
         result = dialog.show()
+        dialog.close()
         
         # Redraw the entire screen after dialog closes
-        self.stdscr.clear()
-        self.stdscr.refresh()
-        self._resize_layout()
+        self._full_redraw()
         
         return result
     
@@ -351,11 +502,10 @@ class TerminalUI:
         """Show a confirmation dialog and return True if confirmed, False otherwise."""
         dialog = ConfirmDialog(self.stdscr, title, message)
         result = dialog.show()
+        dialog.close()
         
         # Redraw the entire screen after dialog closes
-        self.stdscr.clear()
-        self.stdscr.refresh()
-        self._resize_layout()
+        self._full_redraw()
         
         return result
     
@@ -380,6 +530,4 @@ class TerminalUI:
         self.stdscr.getch()
         
         # Redraw the entire screen
-        self.stdscr.clear()
-        self.stdscr.refresh()
-        self._resize_layout()
\ No newline at end of file
+        self._full_redraw()
\ No newline at end of file
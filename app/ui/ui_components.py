@@ -1,8 +1,78 @@
 import curses
+from functools import lru_cache
+from typing import List, Optional
+
+# Task list markers (ASCII only to avoid Unicode display issues)
+_PRIORITY_MARKERS = {1: "!", 2: "!!", 3: "!!!"}
+_STATUS_MARKERS = {
+    "not_started": "[ ]",
+    "in_progress": "[>]",
+    "completed": "[x]",
+    # For backward compatibility
+    "pending": "[ ]"
+}
+
+# Readable priority and status names for the task details
+_PRIORITY_NAMES = {1: "Low", 2: "Medium", 3: "High"}
+_STATUS_NAMES = {
+    "not_started": "Not Started",
+    "in_progress": "In Progress",
+    "completed": "Completed",
+    # For backward compatibility
+    "pending": "Not Started"
+}
+
+
+def wrap_text(text, width):
+    """
+    Word-wrap text into lines of at most width characters.
+    
+    Whitespace runs collapse to single spaces, as with str.split(). Rather
+    than building each line up a word at a time, a full line's worth of
+    text is sliced at once and the break is moved back to the last space;
+    words longer than a whole line are split.
+    """
+    text = " ".join(text.split())
+    width = max(1, width)
+    lines = []
+    start = 0
+    while len(text) - start > width:
+        end = start + width
+        if text[end] == " ":
+            lines.append(text[start:end])
+            start = end + 1
+            continue
+        
+        space = text.rfind(" ", start, end)
+        if space < 0:
+            lines.append(text[start:end])
+            start = end
+        else:
+            lines.append(text[start:space])
+            start = space + 1
+    
+    if start < len(text):
+        lines.append(text[start:])
+    return lines
+
+
+@lru_cache(maxsize=256)
+def _date_part(timestamp):
+    """Return the date part of an ISO 8601 timestamp."""
+    return timestamp.split("T", 1)[0]
+
+
+@lru_cache(maxsize=64)
+def _title_layout(title, width):
+    """Return the padded title text and its x offset, centred on a border of width."""
+    title_str = f" {title} "
+    return title_str, max(1, (width - len(title_str)) // 2)
+
 
 class Window:
     def __init__(self, stdscr, height, width, y, x, title=""):
         """Initialize a window with a border and optional title."""
+        self.stdscr = stdscr
         self.win = stdscr.subwin(height, width, y, x)
         self.height = height
         self.width = width
@@ -10,16 +80,25 @@ class Window:
         self.win.box()
         self.set_title(title)
         self.content_window = self.win.derwin(height - 2, width - 2, 1, 1)
+        self.content_height = height - 2
+        self.content_width = width - 2
         self.selected_index = 0
         self.scroll_offset = 0
         self.max_visible_items = height - 2
+        
+        # (text, attr) of each content row drawn by _paint(); None when the
+        # content window has to be repainted from scratch
+        self._rendered = None
+        
+        # State the content was last drawn from; subclasses skip redrawing
+        # when it hasn't changed. None forces the next redraw.
+        self._last_frame_key = None
     
     def set_title(self, title):
         """Set the window title."""
         self.title = title
         if title:
-            title_str = f" {title} "
-            x = max(1, (self.width - len(title_str)) // 2)
+            title_str, x = _title_layout(title, self.width)
             try:
                 self.win.addstr(0, x, title_str)
             except curses.error:
@@ -29,31 +108,96 @@ class Window:
                 except:
                     pass
     
+    def repaint_title(self, title):
+        """Replace the title, redrawing only the top border line."""
+        # Wipe out the previous, possibly longer, title
+        self.win.hline(0, 1, curses.ACS_HLINE, self.width - 2)
+        self.set_title(title)
+    
     def clear(self):
         """Clear the content window."""
-        self.content_window.clear()
+        # erase() rather than clear(): clear() makes the next update resend
+        # the whole terminal, not just this window's changes
+        self.content_window.erase()
+        self._rendered = None
+        self._last_frame_key = None
     
     def refresh(self):
-        """Refresh the window and its content."""
-        self.win.box()
-        self.set_title(self.title)
-        self.win.refresh()
-        self.content_window.refresh()
+        """
+        Refresh the window and its content.
+        
+        Changes are only staged in the virtual screen; they reach the
+        terminal on the next commit(), which the UI's event loop does once
+        per input event. The border and title are drawn when the window is
+        created or resized and stay in its buffer, so they aren't redrawn.
+        """
+        self.win.noutrefresh()
+        self.content_window.noutrefresh()
+    
+    @staticmethod
+    def commit():
+        """Write all staged window changes to the terminal in one update."""
+        curses.doupdate()
     
     def get_content_dimensions(self):
         """Get the usable dimensions of the content window."""
-        return self.height - 2, self.width - 2
+        return self.content_height, self.content_width
     
     def resize(self, height, width, y, x):
         """Resize and move the window."""
         self.height = height
         self.width = width
-        self.win.resize(height, width)
-        self.win.mvwin(y, x)
+        # Subwindows share their parent's memory, and mvwin() doesn't move
+        # a subwindow within it, so a moved pane would still overlap its
+        # old neighbours. Create the subwindow afresh at its new position.
+        # The old content window goes first: curses can't delete a window
+        # that still has subwindows, so the old pair would otherwise leak.
+        del self.content_window
+        del self.win
+        self.win = self.stdscr.subwin(height, width, y, x)
+        self.win.box()
+        self.set_title(self.title)
         self.content_window = self.win.derwin(height - 2, width - 2, 1, 1)
+        self.content_height = height - 2
+        self.content_width = width - 2
         self.max_visible_items = height - 2
+        self._rendered = None
+        self._last_frame_key = None
         self.refresh()
     
+    def _paint(self, rows):
+        """
+        Draw content rows, skipping the ones that are already on screen.
+        
+        rows is a list of (text, attr) tuples, one per content row. Only
+        rows that differ from the previous call are rewritten, so moving
+        the selection by one only touches two rows.
+        """
+        win = self.content_window
+        old = self._rendered
+        if old is None:
+            win.erase()
+            old = []
+        
+        for i, row in enumerate(rows):
+            if i < len(old) and old[i] == row:
+                continue
+            text, attr = row
+            win.move(i, 0)
+            win.clrtoeol()
+            try:
+                win.addnstr(i, 0, text, self.content_width, attr)
+            except curses.error:
+                # Text reaching the last cell still gets drawn
+                pass
+        
+        # Blank rows that are no longer used
+        for i in range(len(rows), len(old)):
+            win.move(i, 0)
+            win.clrtoeol()
+        
+        self._rendered = rows
+    
     def display_message(self, message):
         """Display a message in the content window."""
         self.clear()
@@ -70,6 +214,7 @@ class TaskListWindow(Window):
     def set_tasks(self, tasks):
         """Set the tasks to display."""
         self.tasks = tasks
+        self._last_frame_key = None
         self.adjust_selection()
         self.refresh_content()
     
@@ -92,62 +237,64 @@ class TaskListWindow(Window):
     
     def refresh_content(self):
         """Refresh the task list content."""
-        self.clear()
-        content_height, content_width = self.get_content_dimensions()
+        # Nothing to do if e.g. the selection didn't move at the list's end
+        frame_key = (
+            self.selected_index, self.scroll_offset, id(self.tasks), len(self.tasks)
+        )
+        if frame_key == self._last_frame_key:
+            return
         
-        if not self.tasks:
-            self.content_window.addstr(0, 0, "No tasks")
-            self.refresh()
+        self._paint(self._render_rows(self.content_width))
+        self.refresh()
+        self._last_frame_key = frame_key
+    
+    def refresh_task_row(self, idx):
+        """Redraw the row of a single task, e.g. after its status changed."""
+        i = idx - self.scroll_offset
+        visible = min(self.max_visible_items, len(self.tasks) - self.scroll_offset)
+        if not 0 <= i < visible:
             return
+        if self._rendered is None:
+            self.refresh_content()
+            return
+        
+        rows = self._rendered.copy()
+        rows[i] = self._render_row(idx, self.content_width)
+        self._paint(rows)
+        
+        # Only the content row changed, so the frame is left alone
+        self.content_window.noutrefresh()
+    
+    def _render_rows(self, content_width):
+        """Return the (text, attr) of each visible row."""
+        if not self.tasks:
+            return [("No tasks", 0)]
         
         # Display visible tasks
-        for i in range(min(self.max_visible_items, len(self.tasks))):
-            idx = i + self.scroll_offset
-            if idx >= len(self.tasks):
-                break
-            
-            task = self.tasks[idx]
-            
-            # Highlight selected task
-            if idx == self.selected_index:
-                self.content_window.attron(curses.A_REVERSE)
-            
-            # Format priority indicator
-            priority_markers = ["!", "!!", "!!!"]
-            priority_str = priority_markers[task['priority'] - 1] if 1 <= task['priority'] <= 3 else ""
-            
-            # Format status with icons (using ASCII only to avoid Unicode display issues)
-            status_map = {
-                "not_started": "[ ]",  # Empty square
-                "in_progress": "[>]",  # Right arrow (in progress) - ASCII version
-                "completed": "[x]",    # Checkmark - ASCII version
-                # For backward compatibility
-                "pending": "[ ]"
-            }
-            status_str = status_map.get(task['status'], "[ ]")
-            
-            # Truncate title if needed
-            max_title_width = content_width - len(priority_str) - len(status_str) - 2
-            title = task['title']
-            if len(title) > max_title_width:
-                title = title[:max_title_width-3] + "..."
-            
-            # Display task line with error handling
-            task_str = f"{status_str} {title} {priority_str}"
-            try:
-                self.content_window.addstr(i, 0, task_str)
-            except curses.error:
-                # Handle display errors gracefully
-                try:
-                    # Try with a simpler string
-                    self.content_window.addstr(i, 0, f"Task {i+1}")
-                except:
-                    pass
-            
-            if idx == self.selected_index:
-                self.content_window.attroff(curses.A_REVERSE)
+        stop = min(self.scroll_offset + self.max_visible_items, len(self.tasks))
+        return [
+            self._render_row(idx, content_width)
+            for idx in range(self.scroll_offset, stop)
+        ]
+    
+    def _render_row(self, idx, content_width):
+        """Return the (text, attr) of the row for the task at list position idx."""
+        task = self.tasks[idx]
         
-        self.refresh()
+        # Highlight selected task
+        attr = curses.A_REVERSE if idx == self.selected_index else 0
+        
+        # Format priority indicator and status icon
+        priority_str = _PRIORITY_MARKERS.get(task['priority'], "")
+        status_str = _STATUS_MARKERS.get(task['status'], "[ ]")
+        
+        # Truncate title if needed
+        max_title_width = content_width - len(priority_str) - len(status_str) - 2
+        title = task['title']
+        if len(title) > max_title_width:
+            title = title[:max_title_width-3] + "..."
+        
+        return f"{status_str} {title} {priority_str}", attr
     
     def select_next(self):
         """Select the next task if available."""
@@ -190,21 +337,9 @@ class TaskDetailWindow(Window):
             self.refresh()
             return
         
-        # Display task properties
-        content_height, content_width = self.get_content_dimensions()
-        
         # Map priority and status to more readable forms
-        priority_map = {1: "Low", 2: "Medium", 3: "High"}
-        status_map = {
-            "not_started": "Not Started",
-            "in_progress": "In Progress",
-            "completed": "Completed",
-            # For backward compatibility
-            "pending": "Not Started"
-        }
-        
-        priority = priority_map.get(self.task['priority'], "Unknown")
-        status = status_map.get(self.task['status'], "Unknown")
+        priority = _PRIORITY_NAMES.get(self.task['priority'], "Unknown")
+        status = _STATUS_NAMES.get(self.task['status'], "Unknown")
         
         # Display task details
         y = 0
@@ -221,31 +356,14 @@ class TaskDetailWindow(Window):
         y += 1
         
         description = self.task['description'] or "No description provided."
-        words = description.split()
-        
-        if words:
-            line = ""
-            for word in words:
-                # Check if adding this word would exceed width
-                if len(line) + len(word) + 1 > content_width:
-                    self.content_window.addstr(y, 0, line)
-                    y += 1
-                    line = word
-                else:
-                    if line:
-                        line += " " + word
-                    else:
-                        line = word
-            
-            # Add the last line if it has content
-            if line:
-                self.content_window.addstr(y, 0, line)
-                y += 1
+        for line in wrap_text(description, self.content_width):
+            self.content_window.addstr(y, 0, line)
+            y += 1
         
         # Display created/updated timestamps
         y += 1
-        created = self.task.get('created_at', '').split('T')[0]
-        updated = self.task.get('updated_at', '').split('T')[0]
+        created = _date_part(self.task.get('created_at', ''))
+        updated = _date_part(self.task.get('updated_at', ''))
         
         if created:
             self.content_window.addstr(y, 0, f"Created: {created}")
@@ -260,22 +378,25 @@ class NotesWindow(Window):
     def __init__(self, stdscr, height, width, y, x, title="Notes"):
         """Initialize a notes window."""
         super().__init__(stdscr, height, width, y, x, title)
-        self.notes = ""
+        # The notes are kept split into lines, with the last line held as
+        # a list of characters, so typing only ever touches the end
+        self._lines = []
+        self._tail = []
         self.edit_mode = False
-        self.cursor_pos = 0
-        self.scroll_offset = 0
         
         # Enable keypad for special key handling
         self.content_window.keypad(True)
     
     def set_notes(self, notes):
         """Set the notes to display."""
-        self.notes = notes if notes else ""
+        self._lines = notes.split("\n") if notes else []
+        self._tail = list(self._lines.pop()) if self._lines else []
+        self._last_frame_key = None
         self.refresh_content()
     
     def get_notes(self):
         """Get the current notes."""
-        return self.notes
+        return "\n".join(self._lines + ["".join(self._tail)])
     
     def toggle_edit_mode(self):
         """Toggle between view and edit mode."""
@@ -292,99 +413,82 @@ class NotesWindow(Window):
         if not self.edit_mode:
             return False
         
-        try:
-            # Simple key handling - safer approach
-            if key in (10, 13, curses.KEY_ENTER):  # Enter
-                # Add a newline at end for simplicity
-                self.notes += "\n"
+        # Simple key handling - only string edits happen here; drawing is
+        # left to refresh_content.
+        if key in (10, 13, curses.KEY_ENTER):  # Enter
+            # Add a newline at end for simplicity
+            self._lines.append("".join(self._tail))
+            self._tail = []
+            
+        elif key in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
+            # Remove last character if there are any, joining the last
+            # two lines when the current one is empty
+            if self._tail:
+                self._tail.pop()
+            elif self._lines:
+                self._tail = list(self._lines.pop())
                 
-            elif key in (curses.KEY_BACKSPACE, 127, 8):  # Backspace
-                # Remove last character if there are any
-                if len(self.notes) > 0:
-                    self.notes = self.notes[:-1]
-                    
-            elif 32 <= key <= 126:  # Printable ASCII characters
-                # Add character to the end
-                self.notes += chr(key)
-            
-            # Refresh after any change
-            self.refresh_content()
-            return True
-            
-        except Exception as e:
-            # Log error by adding to notes
-            self.notes += f"\nError: {str(e)}\n"
-            self.refresh_content()
-            return True
-    
-    def adjust_scroll(self):
-        """Adjust scroll offset to keep cursor visible."""
-        content_height, content_width = self.get_content_dimensions()
-        
-        # Count lines up to cursor
-        lines_to_cursor = self.notes[:self.cursor_pos].count('\n')
+        elif 32 <= key <= 126:  # Printable ASCII characters
+            # Add character to the end
+            self._tail.append(chr(key))
         
-        # Adjust scroll if cursor is off screen
-        if lines_to_cursor < self.scroll_offset:
-            self.scroll_offset = lines_to_cursor
-        elif lines_to_cursor >= self.scroll_offset + content_height:
-            self.scroll_offset = lines_to_cursor - content_height + 1
+        # Refresh after any change
+        self.refresh_content()
+        return True
     
     def refresh_content(self):
         """Refresh the notes content."""
-        try:
-            self.clear()
-            content_height, content_width = self.get_content_dimensions()
-            
-            # Simplified content display
-            if not self.notes:
-                if self.edit_mode:
-                    self.content_window.addstr(0, 0, "Type to add notes...")
-                else:
-                    self.content_window.addstr(0, 0, "No notes. Press 'e' to edit.")
+        # Every edit changes the line count or the current line's length,
+        # so keys that don't edit (or backspace on empty notes) skip this
+        frame_key = (self.edit_mode, len(self._lines), len(self._tail))
+        if frame_key == self._last_frame_key:
+            return
+        
+        self.clear()
+        content_height = self.content_height
+        content_width = self.content_width
+        self._last_frame_key = frame_key
+        if content_height < 2 or content_width < 2:
+            # Too small to show anything without writing the last cell
+            self.refresh()
+            return
+        
+        # Notes text stops short of the right edge; addnstr clips longer lines
+        text_width = content_width - 1
+        max_lines = 0
+        
+        # Simplified content display
+        if not self._lines and not self._tail:
+            if self.edit_mode:
+                self.content_window.addnstr(0, 0, "Type to add notes...", content_width)
             else:
-                # Just display the most recent part of notes (last few lines)
-                lines = self.notes.split('\n')
-                
-                # Display only what fits in the window
-                max_lines = min(content_height - 1, len(lines))
-                start_line = max(0, len(lines) - max_lines)
-                
-                for i in range(max_lines):
-                    line_idx = start_line + i
-                    if line_idx < len(lines):
-                        # Truncate line if needed
-                        display_line = lines[line_idx]
-                        if len(display_line) > content_width - 1:
-                            display_line = display_line[:content_width - 1]
-                        
-                        self.content_window.addstr(i, 0, display_line)
+                self.content_window.addnstr(
+                    0, 0, "No notes. Press 'e' to edit.", content_width
+                )
+        else:
+            # Just display the most recent part of notes (last few lines)
+            line_count = len(self._lines) + 1
             
-            # Add help text at bottom
-            if self.edit_mode and content_height > 1:
-                help_text = "Esc: Save & exit edit mode"
-                if len(help_text) > content_width - 1:
-                    help_text = help_text[:content_width - 1]
-                self.content_window.addstr(content_height - 1, 0, help_text)
-                
-            # In edit mode, position cursor at the end of content
-            if self.edit_mode:
-                # Count displayed lines to find end position
-                line_count = min(max_lines if 'max_lines' in locals() else 0, content_height - 1)
-                if line_count > 0:
-                    self.content_window.move(line_count - 1, 0)
-                else:
-                    self.content_window.move(0, 0)
+            # Display only what fits in the window
+            max_lines = min(content_height - 1, line_count)
+            lines = []
+            if max_lines > 0:
+                lines = self._lines[line_count - max_lines:]
+                lines.append("".join(self._tail))
             
-            self.refresh()
-        except Exception as e:
-            # If there's an error, try a minimal refresh
-            try:
-                self.clear()
-                self.content_window.addstr(0, 0, "Notes")
-                self.refresh()
-            except:
-                pass
+            for i, display_line in enumerate(lines):
+                self.content_window.addnstr(i, 0, display_line, text_width)
+        
+        # Add help text at bottom
+        if self.edit_mode and content_height > 1:
+            help_text = "Esc: Save & exit edit mode"
+            self.content_window.addnstr(content_height - 1, 0, help_text, text_width)
+            
+        # In edit mode, position cursor at the start of the last shown line
+        if self.edit_mode:
+            self.content_window.move(max(0, max_lines - 1), 0)
+        
+        self.refresh()
 
 
 class PlanWindow(Window):
@@ -395,10 +499,15 @@ class PlanWindow(Window):
         self.selected_index = 0
         self.scroll_offset = 0
         self.show_details = False  # Flag to control if details are shown
+        
+        # Formatted "NN. [x] " row prefix of each step, filled in as rows
+        # are drawn; set_steps() resets it, as every plan change does
+        self._prefixes: List[Optional[str]] = []
     
     def set_steps(self, steps):
         """Set the plan steps to display."""
         self.steps = steps
+        self._prefixes = [None] * len(steps)
         self.adjust_selection()
         self.refresh_content()
     
@@ -423,39 +532,43 @@ class PlanWindow(Window):
     
     def refresh_content(self):
         """Refresh the plan content."""
-        self.clear()
-        content_height, content_width = self.get_content_dimensions()
-        
-        if not self.steps:
-            self.content_window.addstr(0, 0, "No plan steps")
-            self.refresh()
-            return
-            
         selected_step = self.get_selected_step()
         
         # If showing details for the selected step
         if self.show_details and selected_step:
-            self._display_step_details(selected_step, content_height, content_width)
+            self.clear()
+            self._display_step_details(
+                selected_step, self.content_height, self.content_width
+            )
             return
-            
+        
         # Otherwise display the list of steps
+        self._paint(self._render_rows(self.content_height, self.content_width))
+        self.refresh()
+    
+    def _render_rows(self, content_height, content_width):
+        """Return the (text, attr) of each row of the step list."""
+        if not self.steps:
+            return [("No plan steps", 0)]
+        
+        rows = []
         list_height = min(content_height, len(self.steps))
         
         # Display visible steps
-        for i in range(min(self.max_visible_items, len(self.steps))):
-            idx = i + self.scroll_offset
-            if idx >= len(self.steps):
-                break
-            
+        stop = min(self.scroll_offset + self.max_visible_items, len(self.steps))
+        for idx in range(self.scroll_offset, stop):
             try:
                 step = self.steps[idx]
                 
                 # Highlight selected step
-                if idx == self.selected_index:
-                    self.content_window.attron(curses.A_REVERSE)
+                attr = curses.A_REVERSE if idx == self.selected_index else 0
                 
                 # Format step with order and completion status
-                completion_status = "[x]" if step['completed'] else "[ ]"
+                prefix = self._prefixes[idx]
+                if prefix is None:
+                    completion_status = "[x]" if step['completed'] else "[ ]"
+                    prefix = f"{step.get('order', 0) + 1:2d}. {completion_status} "
+                    self._prefixes[idx] = prefix
                 
                 # Get name or fallback to description for backward compatibility
                 name = step.get('name', step.get('description', 'Unnamed step'))
@@ -465,35 +578,18 @@ class PlanWindow(Window):
                 if len(name) > max_name_width:
                     name = name[:max_name_width-3] + "..."
                 
-                # Display step line with safe index access
-                order = step.get('order', 0)
-                step_str = f"{order + 1:2d}. {completion_status} {name}"
-                try:
-                    self.content_window.addstr(i, 0, step_str)
-                except curses.error:
-                    # Handle display errors gracefully
-                    try:
-                        # Try with a simpler string
-                        self.content_window.addstr(i, 0, f"Step {order + 1}")
-                    except:
-                        pass
-                
-                if idx == self.selected_index:
-                    self.content_window.attroff(curses.A_REVERSE)
+                rows.append((prefix + name, attr))
             except (IndexError, KeyError) as e:
                 # Handle any index errors gracefully
-                self.content_window.addstr(i, 0, f"Error displaying step: {str(e)}")
-                
+                rows.append((f"Error displaying step: {str(e)}", 0))
+        
         # Add a help line at the bottom if there's space
         if content_height > list_height + 1:
-            help_text = "Enter/Space: Toggle completion | D: Show/hide details"
-            try:
-                self.content_window.addstr(content_height - 1, 0, help_text)
-            except curses.error:
-                pass  # Skip help text if it doesn't fit
-            
-        self.refresh()
+            rows.extend([("", 0)] * (content_height - 1 - len(rows)))
+            rows.append(("Enter/Space: Toggle completion | D: Show/hide details", 0))
         
+        return rows
+    
     def _display_step_details(self, step, height, width):
         """Display detailed information for a plan step."""
         y = 0
@@ -515,20 +611,7 @@ class PlanWindow(Window):
             y += 1
             
             # Word wrap description
-            words = description.split()
-            line = ""
-            for word in words:
-                if len(line) + len(word) + 1 > width:
-                    self.content_window.addstr(y, 0, line)
-                    y += 1
-                    line = word
-                else:
-                    if line:
-                        line += " " + word
-                    else:
-                        line = word
-            
-            if line:
+            for line in wrap_text(description, width):
                 self.content_window.addstr(y, 0, line)
                 y += 1
             
@@ -541,20 +624,7 @@ class PlanWindow(Window):
             y += 1
             
             # Word wrap details
-            words = details.split()
-            line = ""
-            for word in words:
-                if len(line) + len(word) + 1 > width:
-                    self.content_window.addstr(y, 0, line)
-                    y += 1
-                    line = word
-                else:
-                    if line:
-                        line += " " + word
-                    else:
-                        line = word
-            
-            if line:
+            for line in wrap_text(details, width):
                 self.content_window.addstr(y, 0, line)
                 y += 1
         
@@ -596,6 +666,27 @@ class PlanWindow(Window):
         return False
 
 
+# Subwindows of closed dialogs, by (height, width, y, x), for reuse by
+# the next dialog of the same size and position
+_dialog_windows = {}
+_DIALOG_WINDOWS_PER_GEOMETRY = 2
+
+
+def _dialog_window(stdscr, height, width, y, x):
+    """Return a subwindow for a dialog, reusing a released one if possible."""
+    pool = _dialog_windows.get((height, width, y, x))
+    if pool:
+        return pool.pop()
+    return stdscr.subwin(height, width, y, x)
+
+
+def _release_dialog_window(win, height, width, y, x):
+    """Return a closed dialog's subwindow to the pool."""
+    pool = _dialog_windows.setdefault((height, width, y, x), [])
+    if len(pool) < _DIALOG_WINDOWS_PER_GEOMETRY:
+        pool.append(win)
+
+
 class InputDialog:
     def __init__(self, stdscr, title, prompts, initial_values=None):
         """
@@ -626,11 +717,15 @@ class InputDialog:
         self.y = (screen_height - self.height) // 2
         self.x = (screen_width - self.width) // 2
         
-        # Create window
-        self.win = stdscr.subwin(self.height, self.width, self.y, self.x)
+        # Create window, or reuse one from an earlier dialog
+        self.win = _dialog_window(stdscr, self.height, self.width, self.y, self.x)
         self.win.keypad(True)  # Enable keypad mode for special keys
         self.current_field = 0
         self.cursor_pos = len(self.values[0]) if self.values and self.values[0] else 0
+        
+        # Field, cursor and values the dialog was last drawn with; None
+        # until the box, title and prompts have been drawn
+        self._last_frame_key = None
     
     def show(self):
         """Show the dialog and handle input."""
@@ -642,90 +737,117 @@ class InputDialog:
         # Main input loop
         while True:
             self.draw()
+            Window.commit()
             key = self.win.getch()
             
-            if key == curses.KEY_ENTER or key == 10 or key == 13:  # Enter (different codes)
-                curses.curs_set(0)  # Hide cursor
-                return self.values
-            
-            elif key == 27:  # Escape
-                curses.curs_set(0)  # Hide cursor
-                return None
-            
-            elif key == curses.KEY_UP and self.current_field > 0:
-                self.current_field -= 1
-                self.cursor_pos = len(self.values[self.current_field])
-            
-            elif key == curses.KEY_DOWN and self.current_field < len(self.prompts) - 1:
-                self.current_field += 1
-                self.cursor_pos = len(self.values[self.current_field])
-            
-            elif key == 9:  # Tab
-                self.current_field = (self.current_field + 1) % len(self.prompts)
-                self.cursor_pos = len(self.values[self.current_field])
-            
-            elif key == curses.KEY_LEFT and self.cursor_pos > 0:
-                self.cursor_pos -= 1
-            
-            elif key == curses.KEY_RIGHT and self.cursor_pos < len(self.values[self.current_field]):
-                self.cursor_pos += 1
-            
-            elif key in (curses.KEY_BACKSPACE, 127, 8):  # Different backspace codes
-                if self.cursor_pos > 0:
-                    self.values[self.current_field] = (
-                        self.values[self.current_field][:self.cursor_pos - 1] + 
-                        self.values[self.current_field][self.cursor_pos:]
-                    )
+            # Handle any keys queued behind this one (e.g. pasted text or
+            # key repeat) before drawing again
+            while key != -1:
+                if key in (curses.KEY_ENTER, 10, 13):  # Enter (different codes)
+                    curses.curs_set(0)  # Hide cursor
+                    return self.values
+                
+                elif key == 27:  # Escape
+                    curses.curs_set(0)  # Hide cursor
+                    return None
+                
+                elif key == curses.KEY_UP and self.current_field > 0:
+                    self.current_field -= 1
+                    self.cursor_pos = len(self.values[self.current_field])
+                
+                elif (key == curses.KEY_DOWN
+                      and self.current_field < len(self.prompts) - 1):
+                    self.current_field += 1
+                    self.cursor_pos = len(self.values[self.current_field])
+                
+                elif key == 9:  # Tab
+                    self.current_field = (self.current_field + 1) % len(self.prompts)
+                    self.cursor_pos = len(self.values[self.current_field])
+                
+                elif key == curses.KEY_LEFT and self.cursor_pos > 0:
                     self.cursor_pos -= 1
-            
-            elif key == curses.KEY_DC:  # Delete
-                if self.cursor_pos < len(self.values[self.current_field]):
+                
+                elif (key == curses.KEY_RIGHT
+                      and self.cursor_pos < len(self.values[self.current_field])):
+                    self.cursor_pos += 1
+                
+                elif key in (curses.KEY_BACKSPACE, 127, 8):  # Different backspace codes
+                    if self.cursor_pos > 0:
+                        self.values[self.current_field] = (
+                            self.values[self.current_field][:self.cursor_pos - 1] + 
+                            self.values[self.current_field][self.cursor_pos:]
+                        )
+                        self.cursor_pos -= 1
+                
+                elif key == curses.KEY_DC:  # Delete
+                    if self.cursor_pos < len(self.values[self.current_field]):
+                        self.values[self.current_field] = (
+                            self.values[self.current_field][:self.cursor_pos] + 
+                            self.values[self.current_field][self.cursor_pos + 1:]
+                        )
+                
+                elif 32 <= key <= 126:  # Printable characters
                     self.values[self.current_field] = (
                         self.values[self.current_field][:self.cursor_pos] + 
-                        self.values[self.current_field][self.cursor_pos + 1:]
+                        chr(key) + 
+                        self.values[self.current_field][self.cursor_pos:]
                     )
-            
-            elif 32 <= key <= 126:  # Printable characters
-                self.values[self.current_field] = (
-                    self.values[self.current_field][:self.cursor_pos] + 
-                    chr(key) + 
-                    self.values[self.current_field][self.cursor_pos:]
-                )
-                self.cursor_pos += 1
+                    self.cursor_pos += 1
+                
+                self.win.timeout(0)
+                key = self.win.getch()
+                self.win.timeout(-1)
+    
+    def close(self):
+        """Release the dialog's window for reuse; the dialog can't be shown again."""
+        _release_dialog_window(self.win, self.height, self.width, self.y, self.x)
+        del self.win
     
     def draw(self):
         """Draw the dialog box and input fields."""
-        self.win.clear()
+        # Nothing to do if the keys (e.g. Left at the start of a field)
+        # changed nothing
+        frame_key = (self.current_field, self.cursor_pos, tuple(self.values))
+        if frame_key == self._last_frame_key:
+            return
+        
+        if self._last_frame_key is None:
+            self._draw_chrome()
+        else:
+            # Redraw the fields edited since the last draw; with several
+            # keys handled per draw, that can be more than the active one
+            drawn_values = self._last_frame_key[2]
+            for i, value in enumerate(self.values):
+                if value != drawn_values[i]:
+                    self.draw_field(i)
+        self._last_frame_key = frame_key
+        
+        # Place the cursor in the active field
+        self.win.move(self.current_field * 2 + 2, 2 + self.cursor_pos)
+        self.win.noutrefresh()
+    
+    def _draw_chrome(self):
+        """Draw the parts of the dialog that don't change while typing."""
+        self.win.erase()
         self.win.box()
         
         # Draw title
         if self.title:
-            title_str = f" {self.title} "
-            x = max(1, (self.width - len(title_str)) // 2)
+            title_str, x = _title_layout(self.title, self.width)
             self.win.addstr(0, x, title_str)
         
-        # Draw input fields
+        # Draw prompts and their input fields
         for i, prompt in enumerate(self.prompts):
-            y = i * 2 + 1
-            self.win.addstr(y, 2, f"{prompt}:")
-            
-            # Draw input field
-            field_x = 2
-            field_y = y + 1
-            field_width = self.width - 4
-            field_value = self.values[i]
-            
-            # Draw input value
-            self.win.addstr(field_y, field_x, field_value)
-            
-            # Draw cursor if this is the active field
-            if i == self.current_field:
-                self.win.move(field_y, field_x + self.cursor_pos)
+            self.win.addstr(i * 2 + 1, 2, f"{prompt}:")
+            self.draw_field(i)
         
         # Draw instructions
         self.win.addstr(self.height - 1, 2, "Enter: Save | Esc: Cancel")
-        
-        self.win.refresh()
+    
+    def draw_field(self, i):
+        """Draw the value of input field i, blanking the rest of the field."""
+        field_width = self.width - 4
+        self.win.addnstr(i * 2 + 2, 2, self.values[i].ljust(field_width), field_width)
 
 
 class ConfirmDialog:
@@ -739,16 +861,16 @@ class ConfirmDialog:
         screen_height, screen_width = stdscr.getmaxyx()
         self.width = min(50, screen_width - 4)
         
-        # Calculate height based on message length
-        message_lines = (len(message) // (self.width - 4)) + 1
-        self.height = message_lines + 4  # Message + borders + buttons
+        # Wrap the message once; its line count sets the height
+        self._msg_lines = wrap_text(message, self.width - 4)
+        self.height = max(1, len(self._msg_lines)) + 4  # Message + borders + buttons
         
         # Center dialog
         self.y = (screen_height - self.height) // 2
         self.x = (screen_width - self.width) // 2
         
-        # Create window
-        self.win = stdscr.subwin(self.height, self.width, self.y, self.x)
+        # Create window, or reuse one from an earlier dialog
+        self.win = _dialog_window(stdscr, self.height, self.width, self.y, self.x)
         self.selected = 0  # 0 = No, 1 = Yes
     
     def show(self):
@@ -756,9 +878,10 @@ class ConfirmDialog:
         # Enable keypad mode for special keys
         self.win.keypad(True)
         
-        # Main input loop
+        # Main input loop; only the buttons change after the first draw
+        self.draw()
         while True:
-            self.draw()
+            Window.commit()
             key = self.win.getch()
             
             if key == curses.KEY_ENTER or key == 10 or key == 13:  # Enter (different codes)
@@ -769,6 +892,8 @@ class ConfirmDialog:
             
             elif key == curses.KEY_LEFT or key == curses.KEY_RIGHT:
                 self.selected = 1 - self.selected  # Toggle between 0 and 1
+                self._draw_buttons()
+                self.win.noutrefresh()
                 
             # Add handling for y/n keys
             elif key in (ord('y'), ord('Y')):
@@ -777,51 +902,35 @@ class ConfirmDialog:
             elif key in (ord('n'), ord('N')):
                 return False
     
+    def close(self):
+        """Release the dialog's window for reuse; the dialog can't be shown again."""
+        _release_dialog_window(self.win, self.height, self.width, self.y, self.x)
+        del self.win
+    
     def draw(self):
         """Draw the confirmation dialog."""
-        self.win.clear()
+        self.win.erase()
         self.win.box()
         
         # Draw title
         if self.title:
-            title_str = f" {self.title} "
-            x = max(1, (self.width - len(title_str)) // 2)
+            title_str, x = _title_layout(self.title, self.width)
             self.win.addstr(0, x, title_str)
         
         # Draw message
-        message_words = self.message.split()
-        line = ""
-        y = 1
-        
-        for word in message_words:
-            if len(line) + len(word) + 1 <= self.width - 4:
-                if line:
-                    line += " " + word
-                else:
-                    line = word
-            else:
-                self.win.addstr(y, 2, line)
-                y += 1
-                line = word
-        
-        if line:
+        for y, line in enumerate(self._msg_lines, 1):
             self.win.addstr(y, 2, line)
         
-        # Draw buttons
+        self._draw_buttons()
+        self.win.noutrefresh()
+    
+    def _draw_buttons(self):
+        """Draw the No/Yes buttons, highlighting the selected one."""
         button_y = self.height - 2
         no_x = self.width // 3 - 2
         yes_x = 2 * self.width // 3 - 2
         
-        if self.selected == 0:
-            self.win.attron(curses.A_REVERSE)
-        self.win.addstr(button_y, no_x, " No ")
-        if self.selected == 0:
-            self.win.attroff(curses.A_REVERSE)
-        
-        if self.selected == 1:
-            self.win.attron(curses.A_REVERSE)
-        self.win.addstr(button_y, yes_x, " Yes ")
-        if self.selected == 1:
-            self.win.attroff(curses.A_REVERSE)
-        
-        self.win.refresh()
\ No newline at end of file
+        no_attr = curses.A_REVERSE if self.selected == 0 else 0
+        yes_attr = curses.A_REVERSE if self.selected == 1 else 0
+        self.win.addstr(button_y, no_x, " No ", no_attr)
+        self.win.addstr(button_y, yes_x, " Yes ", yes_attr)
\ No newline at end of file
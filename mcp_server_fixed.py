@@ -4,14 +4,19 @@ MCP-compatible server for the Terminal Task Tracker
 
 This server exposes the task tracker functionality through the Model Context Protocol (MCP).
 """
-import json
+import asyncio
+import contextvars
+import functools
 import os
 import logging
+import re
 from typing import Dict, List, Optional, Any, Union, AsyncIterator
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from collections.abc import AsyncIterator
 
 from mcp.server.fastmcp import FastMCP, Context, Image
+from app.core import storage
 from app.core.task_manager import TaskManager
 from app.core.plan_manager import PlanManager
 from app.api.api import TaskTrackerAPI
@@ -21,16 +26,199 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Initialize data files
+# Data file locations; the directory is created when the server starts
 home_dir = os.path.expanduser("~")
 data_dir = os.path.join(home_dir, ".tasktracker")
-os.makedirs(data_dir, exist_ok=True)
 task_file = os.path.join(data_dir, "tasks.json")
 plan_file = os.path.join(data_dir, "plan.json")
 notes_file = os.path.join(data_dir, "notes.txt")
 
-# Global variable for API access from resources without URI parameters
-global_api = None
+# Task and step IDs are UUIDs (hex, or hyphenated in older data files);
+# anything not shaped like an ID can't match one, so it is rejected
+# without touching the data files
+_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# (st_mtime_ns, st_size) of each data file when it was last read or written
+# by this server, so unchanged files aren't re-read on every request
+_file_stats = {}
+
+
+def _file_stat(path):
+    """Return the (mtime, size) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _dumps(obj):
+    """Serialize obj to an indented JSON string (with orjson when available)."""
+    return storage.dumps(obj).decode("utf-8")
+
+
+# Encoded resource payloads by URI, as (data version, JSON string); the
+# version includes the manager, so a new API never reuses stale payloads
+_encoded = {}
+_ENCODED_CACHE_SIZE = 1024
+
+
+def _cached_dumps(uri, manager, obj):
+    """Return _dumps(obj), reusing the last result until the data changes."""
+    version = (manager, manager.version)
+    cached = _encoded.get(uri)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    payload = _dumps(obj)
+    if len(_encoded) >= _ENCODED_CACHE_SIZE:
+        _encoded.clear()
+    _encoded[uri] = (version, payload)
+    return payload
+
+
+def _data_files(api):
+    """
+    Yield (path, reload, flush) for each data file behind the API.
+    
+    flush saves the file's unsaved changes and returns True if it wrote
+    anything; it is None for the notes, which are always written at once.
+    """
+    tasks, plan = api.task_manager, api.plan_manager
+    yield tasks.file_path, tasks.reload_tasks, tasks.flush
+    yield tasks.notes_file_path, tasks.reload_notes, None
+    yield plan.file_path, plan.reload_plan, plan.flush
+
+
+def _maybe_reload(api):
+    """Reload only the data files that changed on disk since we last saw them."""
+    for path, reload, flush in _data_files(api):
+        stat = _file_stat(path)
+        if path in _file_stats and _file_stats[path] == stat:
+            continue
+        if flush is not None and flush():
+            # Reloading would drop edits that are still waiting to be
+            # saved, so they are written over the file instead, losing
+            # whatever the other writer changed
+            if path in _file_stats:
+                logger.warning(
+                    "%s changed on disk while changes to it were waiting to be "
+                    "saved; overwrote it with the server's version", path
+                )
+            _file_stats[path] = _file_stat(path)
+        else:
+            reload()
+            _file_stats[path] = stat
+
+
+def _save_all(api):
+    """
+    Save all pending changes and record the new stats of the files
+    written, so the server's own writes don't cause a reload.
+    """
+    global _save_pending
+    _save_pending = False
+    for path, _, flush in _data_files(api):
+        if flush is not None and flush():
+            _file_stats[path] = _file_stat(path)
+
+
+# Delay before saving after a change; tool calls arriving within it share
+# a single write of each file
+_SAVE_DELAY = 0.05
+
+# Handlers that use the data run one at a time on this thread, which keeps
+# the blocking file reads and writes off the event loop
+_data_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="tasktracker-data"
+)
+
+# The server's event loop while it is running, and whether a delayed save
+# has been scheduled on it
+_loop = None
+_save_pending = False
+
+
+def _delayed_save(api):
+    """
+    Run a scheduled save on the data thread. Its result is never awaited,
+    so a failure is logged here rather than lost; the changes stay unsaved
+    and are retried by the next save.
+    """
+    try:
+        _save_all(api)
+    except Exception:
+        logger.exception("Saving the data files failed")
+
+
+def _schedule_save(api):
+    """Save pending changes shortly, coalescing the writes of a burst of tool calls."""
+    global _save_pending
+    if _loop is None:
+        # Not running under the server (e.g. called directly)
+        _save_all(api)
+    elif not _save_pending:
+        _save_pending = True
+        # Called from the data thread; the timer lives on the event loop
+        # and hands the save back to the data thread
+        _loop.call_soon_threadsafe(
+            _loop.call_later, _SAVE_DELAY, _data_executor.submit, _delayed_save, api
+        )
+
+
+@contextmanager
+def _transaction(api):
+    """
+    Run a block of changes against fresh data and save them afterwards.
+    
+    Data files that changed on disk are reloaded on entry; any changes
+    left unsaved by the block are saved (coalesced) on exit.
+    """
+    _maybe_reload(api)
+    yield api
+    if api.has_unsaved_changes():
+        _schedule_save(api)
+
+
+def _read(ctx, getter, *args):
+    """
+    Shared body of the read-only handlers.
+    
+    Reloads the data files that changed on disk and returns the result of
+    calling the API method named getter with args. Returns None without
+    reading anything if the first argument is a malformed ID.
+    """
+    if args and not _ID_RE.fullmatch(args[0]):
+        return None
+    api = ctx.request_context.lifespan_context["api"]
+    _maybe_reload(api)
+    return getattr(api, getter)(*args)
+
+
+def _read_json(ctx, uri, manager, getter, *args):
+    """
+    Like _read(), but return the result as JSON for the resource at uri,
+    reusing the encoded payload while the named manager's data is unchanged.
+    """
+    result = _read(ctx, getter, *args)
+    if result is None:
+        return None
+    api = ctx.request_context.lifespan_context["api"]
+    return _cached_dumps(uri, getattr(api, manager), result)
+
+
+def _off_loop(fn):
+    """Wrap a blocking handler into a coroutine that runs it on the data thread."""
+    @functools.wraps(fn)
+    async def handler(*args, **kwargs):
+        # Run in a copy of the request's context so mcp.get_context() works
+        # on the data thread
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            _data_executor, functools.partial(context.run, fn, *args, **kwargs)
+        )
+    return handler
+
 
 # Set up lifespan context manager for the MCP server
 @asynccontextmanager
@@ -41,26 +229,31 @@ async def lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     This ensures that we have a single consistent instance of the managers
     throughout the server's lifecycle.
     """
-    logger.info(f"Starting TaskTracker server with data directory: {data_dir}")
+    logger.info("Starting TaskTracker server with data directory: %s", data_dir)
+    
+    os.makedirs(data_dir, exist_ok=True)
     
     # Initialize managers with explicit file paths
     task_manager = TaskManager(task_file, notes_file)
     plan_manager = PlanManager(plan_file)
     
-    # Create API
+    # Create API; changes are saved in batches by _schedule_save()
     api = TaskTrackerAPI(task_manager, plan_manager)
+    api.set_autosave(False)
     
-    # Set global API for resources without URI parameters
-    global global_api
-    global_api = api
+    global _loop
+    _loop = asyncio.get_running_loop()
     
     try:
         # Yield the API instance to the server
         yield {"api": api}
     finally:
-        # Ensure all data is saved on shutdown
+        # Ensure all data is saved on shutdown, after any queued handlers.
+        # The wait blocks rather than awaits: the server task is usually
+        # being cancelled, which would abandon an await before the save ends
         logger.info("Shutting down TaskTracker server, saving all data")
-        api.save_all()
+        _loop = None
+        _data_executor.submit(_save_all, api).result()
 
 # Create an MCP server with the lifespan manager
 mcp = FastMCP("TaskTracker", lifespan=lifespan)
@@ -68,57 +261,53 @@ mcp = FastMCP("TaskTracker", lifespan=lifespan)
 
 # === Resources ===
 
-@mcp.resource("tasks://all")
+# The parameterless resources take no ctx parameter, which would turn them
+# into URI templates FastMCP can't match; they look up the context instead
+
+@mcp.resource("tasks://all", mime_type="application/json")
+@_off_loop
 def get_all_tasks() -> str:
     """Get all tasks in the system as JSON."""
-    # Reload data from files first to ensure we have latest changes
-    global_api.reload_all()
-    tasks = global_api.get_all_tasks()
-    return json.dumps(tasks, indent=2)
+    return _read_json(mcp.get_context(), "tasks://all", "task_manager", "get_all_tasks")
 
 
 @mcp.resource("tasks://{task_id}")
-def get_task(task_id: str) -> str:
+@_off_loop
+def get_task(task_id: str, ctx: Context) -> str:
     """Get a specific task by ID."""
-    # Reload data from files first to ensure we have latest changes
-    global_api.reload_all()
-    task = global_api.get_task(task_id)
-    if task:
-        return json.dumps(task, indent=2)
-    return "Task not found"
+    task = _read_json(ctx, f"tasks://{task_id}", "task_manager", "get_task", task_id)
+    return task or "Task not found"
 
 
-@mcp.resource("plan://all")
+@mcp.resource("plan://all", mime_type="application/json")
+@_off_loop
 def get_all_plan_steps() -> str:
     """Get all plan steps in the system as JSON."""
-    # Reload data from files first to ensure we have latest changes
-    global_api.reload_all()
-    steps = global_api.get_all_plan_steps()
-    return json.dumps(steps, indent=2)
+    return _read_json(
+        mcp.get_context(), "plan://all", "plan_manager", "get_all_plan_steps"
+    )
 
 
 @mcp.resource("plan://{step_id}")
-def get_plan_step(step_id: str) -> str:
+@_off_loop
+def get_plan_step(step_id: str, ctx: Context) -> str:
     """Get a specific plan step by ID."""
-    # Reload data from files first to ensure we have latest changes
-    global_api.reload_all()
-    step = global_api.get_plan_step(step_id)
-    if step:
-        return json.dumps(step, indent=2)
-    return "Plan step not found"
+    step = _read_json(
+        ctx, f"plan://{step_id}", "plan_manager", "get_plan_step", step_id
+    )
+    return step or "Plan step not found"
 
 
 @mcp.resource("notes://all")
+@_off_loop
 def get_notes() -> str:
     """Get all notes in the system."""
-    # Reload data from files first to ensure we have latest changes
-    global_api.reload_all()
-    return global_api.get_notes()
+    return _read(mcp.get_context(), "get_notes")
 
 
 # === Tools ===
 
-@mcp.tool()
+@_off_loop
 def get_all_tasks_tool(ctx: Context) -> List[Dict[str, Any]]:
     """
     Get all tasks in the system.
@@ -126,13 +315,10 @@ def get_all_tasks_tool(ctx: Context) -> List[Dict[str, Any]]:
     Returns:
         List of all tasks
     """
-    api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    return api.get_all_tasks()
+    return _read(ctx, "get_all_tasks")
 
 
-@mcp.tool()
+@_off_loop
 def get_task_tool(task_id: str, ctx: Context) -> Dict[str, Any]:
     """
     Get a specific task by ID.
@@ -143,16 +329,10 @@ def get_task_tool(task_id: str, ctx: Context) -> Dict[str, Any]:
     Returns:
         The task or an error message if not found
     """
-    api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    task = api.get_task(task_id)
-    if task:
-        return task
-    return {"error": "Task not found"}
+    return _read(ctx, "get_task", task_id) or {"error": "Task not found"}
 
 
-@mcp.tool()
+@_off_loop
 def get_all_plan_steps_tool(ctx: Context) -> List[Dict[str, Any]]:
     """
     Get all plan steps in the system.
@@ -160,13 +340,10 @@ def get_all_plan_steps_tool(ctx: Context) -> List[Dict[str, Any]]:
     Returns:
         List of all plan steps
     """
-    api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    return api.get_all_plan_steps()
+    return _read(ctx, "get_all_plan_steps")
 
 
-@mcp.tool()
+@_off_loop
 def get_plan_step_tool(step_id: str, ctx: Context) -> Dict[str, Any]:
     """
     Get a specific plan step by ID.
@@ -177,16 +354,10 @@ def get_plan_step_tool(step_id: str, ctx: Context) -> Dict[str, Any]:
     Returns:
         The plan step or an error message if not found
     """
-    api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    step = api.get_plan_step(step_id)
-    if step:
-        return step
-    return {"error": "Plan step not found"}
+    return _read(ctx, "get_plan_step", step_id) or {"error": "Plan step not found"}
 
 
-@mcp.tool()
+@_off_loop
 def get_notes_tool(ctx: Context) -> str:
     """
     Get all notes in the system.
@@ -194,13 +365,10 @@ def get_notes_tool(ctx: Context) -> str:
     Returns:
         The notes text
     """
-    api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    return api.get_notes()
+    return _read(ctx, "get_notes")
 
 
-@mcp.tool()
+@_off_loop
 def add_task(title: str, ctx: Context, description: str = "", priority: int = 1, 
              status: str = "not_started") -> Dict[str, Any]:
     """
@@ -217,15 +385,13 @@ def add_task(title: str, ctx: Context, description: str = "", priority: int = 1,
         The newly created task
     """
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    task = api.add_task(title, description, priority, status)
-    api.save_all()
-    logger.info(f"Added task: {title} (ID: {task['id']})")
+    with _transaction(api):
+        task = api.add_task(title, description, priority, status)
+    logger.info("Added task: %s (ID: %s)", title, task['id'])
     return task
 
 
-@mcp.tool()
+@_off_loop
 def update_task(task_id: str, ctx: Context, title: Optional[str] = None, 
                 description: Optional[str] = None, priority: Optional[int] = None,
                 status: Optional[str] = None) -> Dict[str, Any]:
@@ -242,30 +408,20 @@ def update_task(task_id: str, ctx: Context, title: Optional[str] = None,
     Returns:
         The updated task or None if task not found
     """
+    if not _ID_RE.fullmatch(task_id):
+        return {"error": "Task not found"}
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    kwargs = {}
-    if title is not None:
-        kwargs["title"] = title
-    if description is not None:
-        kwargs["description"] = description
-    if priority is not None:
-        kwargs["priority"] = priority
-    if status is not None:
-        kwargs["status"] = status
-        
-    task = api.update_task(task_id, **kwargs)
+    with _transaction(api):
+        task = api.update_task(task_id, title=title, description=description,
+                               priority=priority, status=status)
     if task:
-        api.save_all()
-        logger.info(f"Updated task ID: {task_id}")
+        logger.info("Updated task ID: %s", task_id)
     else:
-        logger.warning(f"Failed to update task: {task_id} - Not found")
+        logger.warning("Failed to update task: %s - Not found", task_id)
     return task or {"error": "Task not found"}
 
 
-@mcp.tool()
+@_off_loop
 def delete_task(task_id: str, ctx: Context) -> Dict[str, Any]:
     """
     Delete a task.
@@ -276,20 +432,19 @@ def delete_task(task_id: str, ctx: Context) -> Dict[str, Any]:
     Returns:
         Success or failure message
     """
+    if not _ID_RE.fullmatch(task_id):
+        return {"success": False, "message": "Task not found"}
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    result = api.delete_task(task_id)
+    with _transaction(api):
+        result = api.delete_task(task_id)
     if result:
-        api.save_all()
-        logger.info(f"Deleted task ID: {task_id}")
+        logger.info("Deleted task ID: %s", task_id)
         return {"success": True, "message": "Task deleted successfully"}
-    logger.warning(f"Failed to delete task: {task_id} - Not found")
+    logger.warning("Failed to delete task: %s - Not found", task_id)
     return {"success": False, "message": "Task not found"}
 
 
-@mcp.tool()
+@_off_loop
 def add_plan_step(name: str, ctx: Context, description: str = "", details: str = "",
                   order: Optional[int] = None, completed: bool = False) -> Dict[str, Any]:
     """
@@ -306,16 +461,13 @@ def add_plan_step(name: str, ctx: Context, description: str = "", details: str =
         The newly created plan step
     """
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    step = api.add_plan_step(name, description, details, order, completed)
-    api.save_all()
-    logger.info(f"Added plan step: {name} (ID: {step['id']})")
+    with _transaction(api):
+        step = api.add_plan_step(name, description, details, order, completed)
+    logger.info("Added plan step: %s (ID: %s)", name, step['id'])
     return step
 
 
-@mcp.tool()
+@_off_loop
 def update_plan_step(step_id: str, ctx: Context, name: Optional[str] = None,
                      description: Optional[str] = None, details: Optional[str] = None,
                      order: Optional[int] = None, completed: Optional[bool] = None) -> Dict[str, Any]:
@@ -333,32 +485,20 @@ def update_plan_step(step_id: str, ctx: Context, name: Optional[str] = None,
     Returns:
         The updated plan step or None if not found
     """
+    if not _ID_RE.fullmatch(step_id):
+        return {"error": "Plan step not found"}
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    kwargs = {}
-    if name is not None:
-        kwargs["name"] = name
-    if description is not None:
-        kwargs["description"] = description
-    if details is not None:
-        kwargs["details"] = details
-    if order is not None:
-        kwargs["order"] = order
-    if completed is not None:
-        kwargs["completed"] = completed
-        
-    step = api.update_plan_step(step_id, **kwargs)
+    with _transaction(api):
+        step = api.update_plan_step(step_id, name=name, description=description,
+                                    details=details, order=order, completed=completed)
     if step:
-        api.save_all()
-        logger.info(f"Updated plan step ID: {step_id}")
+        logger.info("Updated plan step ID: %s", step_id)
     else:
-        logger.warning(f"Failed to update plan step: {step_id} - Not found")
+        logger.warning("Failed to update plan step: %s - Not found", step_id)
     return step or {"error": "Plan step not found"}
 
 
-@mcp.tool()
+@_off_loop
 def delete_plan_step(step_id: str, ctx: Context) -> Dict[str, Any]:
     """
     Delete a plan step.
@@ -369,20 +509,19 @@ def delete_plan_step(step_id: str, ctx: Context) -> Dict[str, Any]:
     Returns:
         Success or failure message
     """
+    if not _ID_RE.fullmatch(step_id):
+        return {"success": False, "message": "Plan step not found"}
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    result = api.delete_plan_step(step_id)
+    with _transaction(api):
+        result = api.delete_plan_step(step_id)
     if result:
-        api.save_all()
-        logger.info(f"Deleted plan step ID: {step_id}")
+        logger.info("Deleted plan step ID: %s", step_id)
         return {"success": True, "message": "Plan step deleted successfully"}
-    logger.warning(f"Failed to delete plan step: {step_id} - Not found")
+    logger.warning("Failed to delete plan step: %s - Not found", step_id)
     return {"success": False, "message": "Plan step not found"}
 
 
-@mcp.tool()
+@_off_loop
 def toggle_plan_step(step_id: str, ctx: Context) -> Dict[str, Any]:
     """
     Toggle the completion status of a plan step.
@@ -393,20 +532,20 @@ def toggle_plan_step(step_id: str, ctx: Context) -> Dict[str, Any]:
     Returns:
         The updated plan step or None if not found
     """
+    if not _ID_RE.fullmatch(step_id):
+        return {"error": "Plan step not found"}
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    step = api.toggle_plan_step(step_id)
+    with _transaction(api):
+        step = api.toggle_plan_step(step_id)
     if step:
-        api.save_all()
-        logger.info(f"Toggled completion status of plan step ID: {step_id} to {step['completed']}")
+        logger.info("Toggled completion status of plan step ID: %s to %s",
+                    step_id, step['completed'])
     else:
-        logger.warning(f"Failed to toggle plan step: {step_id} - Not found")
+        logger.warning("Failed to toggle plan step: %s - Not found", step_id)
     return step or {"error": "Plan step not found"}
 
 
-@mcp.tool()
+@_off_loop
 def save_notes(notes_text: str, ctx: Context) -> Dict[str, Any]:
     """
     Save notes to the system.
@@ -418,16 +557,15 @@ def save_notes(notes_text: str, ctx: Context) -> Dict[str, Any]:
         Success message
     """
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
-    
-    api.save_notes(notes_text)
-    api.save_all()
+    with _transaction(api):
+        api.save_notes(notes_text)
+        notes_path = api.task_manager.notes_file_path
+        _file_stats[notes_path] = _file_stat(notes_path)
     logger.info("Notes saved")
     return {"success": True, "message": "Notes saved successfully"}
 
 
-@mcp.tool()
+@_off_loop
 def export_data(file_path: str, ctx: Context) -> Dict[str, Any]:
     """
     Export all data to a JSON file.
@@ -439,19 +577,19 @@ def export_data(file_path: str, ctx: Context) -> Dict[str, Any]:
         Success or failure message
     """
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
+    # Reload any data files that changed on disk
+    _maybe_reload(api)
     
     try:
         api.export_data(file_path)
-        logger.info(f"Data exported to {file_path}")
+        logger.info("Data exported to %s", file_path)
         return {"success": True, "message": f"Data exported to {file_path}"}
     except Exception as e:
-        logger.error(f"Export failed: {str(e)}")
+        logger.error("Export failed: %s", e)
         return {"success": False, "message": f"Export failed: {str(e)}"}
 
 
-@mcp.tool()
+@_off_loop
 def import_data(file_path: str, ctx: Context) -> Dict[str, Any]:
     """
     Import data from a JSON file.
@@ -463,23 +601,60 @@ def import_data(file_path: str, ctx: Context) -> Dict[str, Any]:
         Success or failure message
     """
     api = ctx.request_context.lifespan_context["api"]
-    # Reload data from files first to ensure we have latest changes
-    api.reload_all()
     
     try:
-        result = api.import_data(file_path)
+        with _transaction(api):
+            result = api.import_data(file_path)
         if result:
-            logger.info(f"Data imported from {file_path}")
+            logger.info("Data imported from %s", file_path)
             return {"success": True, "message": "Data imported successfully"}
-        logger.warning(f"Import failed from {file_path}")
+        logger.warning("Import failed from %s", file_path)
         return {"success": False, "message": "Import failed"}
     except Exception as e:
-        logger.error(f"Import failed: {str(e)}")
+        logger.error("Import failed: %s", e)
         return {"success": False, "message": f"Import failed: {str(e)}"}
 
 
+# Every tool, registered with the server in this order; FastMCP builds each
+# tool's name, description and argument schema from the function itself
+_TOOLS = (
+    get_all_tasks_tool,
+    get_task_tool,
+    get_all_plan_steps_tool,
+    get_plan_step_tool,
+    get_notes_tool,
+    add_task,
+    update_task,
+    delete_task,
+    add_plan_step,
+    update_plan_step,
+    delete_plan_step,
+    toggle_plan_step,
+    save_notes,
+    export_data,
+    import_data,
+)
+
+for tool in _TOOLS:
+    mcp.add_tool(tool)
+
+
 # === Prompts ===
 
+# Fixed prompt text, built once rather than on every request
+_CREATE_PLAN_PROMPT = """I need to create a new project plan. \
+Please help me break down this project into clear steps.
+
+For each step, I need:
+1. A clear name
+2. A brief description
+3. Any detailed information needed to complete the step
+4. The logical order of the steps
+
+Please ask me about my project goals so you can help create an appropriate plan.
+"""
+
+
 @mcp.prompt()
 def add_task_prompt(title: str = "", description: str = "") -> str:
     """Create a prompt to add a new task."""
@@ -494,16 +669,7 @@ Please provide any missing information and set the priority and status.
 @mcp.prompt()
 def create_plan_prompt() -> str:
     """Create a prompt to help create a new project plan."""
-    return """I need to create a new project plan. Please help me break down this project into clear steps.
-
-For each step, I need:
-1. A clear name
-2. A brief description
-3. Any detailed information needed to complete the step
-4. The logical order of the steps
-
-Please ask me about my project goals so you can help create an appropriate plan.
-"""
+    return _CREATE_PLAN_PROMPT
 
 
 # Define a main function for entry point
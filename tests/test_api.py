@@ -0,0 +1,135 @@
+"""
+Tests for the saving and importing of the TaskTrackerAPI.
+"""
+import json
+
+import pytest
+
+from app.api.api import TaskTrackerAPI
+from app.core import storage
+from app.core.plan_manager import PlanManager
+from app.core.task_manager import TaskManager
+
+
+@pytest.fixture
+def api(tmp_path):
+    """Create a TaskTrackerAPI backed by data files in a temporary directory."""
+    return TaskTrackerAPI(
+        TaskManager(str(tmp_path / "tasks.json"), str(tmp_path / "notes.txt")),
+        PlanManager(str(tmp_path / "plan.json"))
+    )
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Record the path of every data file written."""
+    written = []
+    write_json = storage.write_json
+
+    def record(file_path, obj):
+        written.append(file_path)
+        write_json(file_path, obj)
+
+    monkeypatch.setattr(storage, "write_json", record)
+    return written
+
+
+def test_autosave_writes_each_change(api, writes):
+    """Test that each change is saved at once while autosave is on."""
+    api.add_task("Task 1")
+    api.add_plan_step("Step 1")
+
+    assert writes == [api.task_manager.file_path, api.plan_manager.file_path]
+    assert not api.has_unsaved_changes()
+
+
+def test_autosave_off_defers_until_flush(api, writes):
+    """Test that nothing is written with autosave off until the data is flushed."""
+    api.set_autosave(False)
+    task = api.add_task("Task 1")
+    api.update_task(task["id"], status="completed")
+    api.add_plan_step("Step 1")
+
+    assert writes == []
+    assert api.has_unsaved_changes()
+
+    assert api.task_manager.flush()
+    assert api.plan_manager.flush()
+    assert writes == [api.task_manager.file_path, api.plan_manager.file_path]
+    assert not api.has_unsaved_changes()
+
+    # Flushing again without changes writes nothing
+    assert not api.task_manager.flush()
+    assert writes == [api.task_manager.file_path, api.plan_manager.file_path]
+
+
+def test_save_all_only_writes_changes(api, writes):
+    """Test that save_all writes only the files with unsaved changes."""
+    api.set_autosave(False)
+    api.save_all()
+    assert writes == []
+
+    api.add_task("Task 1")
+    api.save_all()
+    assert writes == [api.task_manager.file_path]
+
+    api.save_all()
+    assert writes == [api.task_manager.file_path]
+
+
+def test_nested_batch_writes_once(api, writes):
+    """Test that nested batches write once, when the outer one exits."""
+    with api.batch():
+        task = api.add_task("Task 1")
+        with api.batch():
+            api.update_task(task["id"], title="Renamed")
+            api.add_plan_step("Step 1")
+        assert writes == []
+        api.add_task("Task 2")
+
+    assert writes == [api.task_manager.file_path, api.plan_manager.file_path]
+    assert not api.has_unsaved_changes()
+
+    # Autosave is back on after the batch
+    api.add_task("Task 3")
+    assert writes[-1] == api.task_manager.file_path
+    assert len(writes) == 3
+
+
+@pytest.mark.parametrize("document", [
+    [],
+    {"tasks": {}},
+    {"tasks": [], "plan": "steps"},
+    {"tasks": [], "plan": [], "notes": ["not", "text"]},
+])
+def test_import_malformed_changes_nothing(api, tmp_path, document):
+    """Test that a malformed import leaves the existing data untouched."""
+    task = api.add_task("Existing Task")
+    step = api.add_plan_step("Existing Step")
+    path = tmp_path / "import.json"
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+    assert not api.import_data(str(path))
+
+    assert api.get_all_tasks() == [task]
+    assert api.get_all_plan_steps() == [step]
+
+
+def test_import_drops_malformed_records(api, tmp_path):
+    """Test that records that can't be indexed or sorted don't fail the import."""
+    path = tmp_path / "import.json"
+    path.write_text(json.dumps({
+        "tasks": [{"id": "a", "title": "A"}, {"id": ["b"]}, "c"],
+        "plan": [
+            {"id": "x", "name": "X", "order": "late"},
+            {"id": "y", "name": "Y", "order": 0},
+            {"id": {}, "name": "Z"},
+        ],
+        "notes": "Imported notes",
+    }), encoding="utf-8")
+
+    assert api.import_data(str(path))
+
+    assert [task["id"] for task in api.get_all_tasks()] == ["a"]
+    assert [step["id"] for step in api.get_all_plan_steps()] == ["y", "x"]
+    assert api.get_notes() == "Imported notes"
@@ -1,9 +1,10 @@
 """
 Tests for the TaskTracker MCP server.
 """
+import asyncio
 import json
 import pytest
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 
 # Import the MCP server
 import sys
@@ -12,108 +13,189 @@ import os
 # Add the parent directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import mcp_server
+from mcp.shared.memory import create_connected_server_and_client_session
+
+import mcp_server_fixed as mcp_server
+from app.api.api import TaskTrackerAPI
+from app.core.plan_manager import PlanManager
+from app.core.task_manager import TaskManager
+
+
+@pytest.fixture
+def api(tmp_path):
+    """Create a TaskTrackerAPI backed by data files in a temporary directory."""
+    api = TaskTrackerAPI(
+        TaskManager(str(tmp_path / "tasks.json"), str(tmp_path / "notes.txt")),
+        PlanManager(str(tmp_path / "plan.json"))
+    )
+    # Save the way the server does, through its own save path
+    api.set_autosave(False)
+    return api
 
 
 @pytest.fixture
-def mock_api():
-    """Create a mock TaskTrackerAPI for testing."""
-    mock = MagicMock()
-    
-    # Set up return values for get_all_tasks
-    mock.get_all_tasks.return_value = [
-        {
-            "id": "test-task-1",
-            "title": "Test Task 1",
-            "description": "Description for test task 1",
-            "priority": 1,
-            "status": "not_started",
-            "created_at": "2025-04-08T00:00:00",
-            "updated_at": "2025-04-08T00:00:00"
-        }
-    ]
-    
-    # Set up return values for get_task
-    mock.get_task.return_value = {
-        "id": "test-task-1",
-        "title": "Test Task 1",
-        "description": "Description for test task 1",
-        "priority": 1,
-        "status": "not_started",
-        "created_at": "2025-04-08T00:00:00",
-        "updated_at": "2025-04-08T00:00:00"
-    }
-    
-    # Set up return values for add_task
-    mock.add_task.return_value = {
-        "id": "new-task-1",
-        "title": "New Task",
-        "description": "Description for new task",
-        "priority": 1,
-        "status": "not_started",
-        "created_at": "2025-04-08T00:00:00",
-        "updated_at": "2025-04-08T00:00:00"
-    }
-    
-    return mock
-
-
-@patch("mcp_server.api")
-def test_get_all_tasks(mock_api_module, mock_api):
-    """Test the get_all_tasks resource."""
-    # Set the mock API
-    mock_api_module.get_all_tasks.return_value = mock_api.get_all_tasks.return_value
+def ctx(api, monkeypatch):
+    """Create a fake MCP Context whose lifespan context holds the API."""
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context={"api": api})
+    )
+    # Parameterless resources look the context up rather than taking it
+    monkeypatch.setattr(mcp_server.mcp, "get_context", lambda: ctx)
+    return ctx
+
+
+def test_get_all_tasks(ctx, api):
+    """Test the tasks://all resource."""
+    api.add_task("Test Task 1", "Description for test task 1")
     
     # Call the function
-    result = mcp_server.get_all_tasks()
+    result = asyncio.run(mcp_server.get_all_tasks())
     
     # Assert the result
-    expected = json.dumps(mock_api.get_all_tasks.return_value, indent=2)
+    expected = json.dumps(api.get_all_tasks(), indent=2)
     assert result == expected
-    mock_api_module.get_all_tasks.assert_called_once()
+    assert json.loads(result)[0]["title"] == "Test Task 1"
+
+
+def test_get_all_tasks_tool(ctx, api):
+    """Test the get_all_tasks_tool tool."""
+    task = api.add_task("Test Task 1")
+    
+    result = asyncio.run(mcp_server.get_all_tasks_tool(ctx))
+    
+    assert result == [task]
 
 
-@patch("mcp_server.api")
-def test_get_task(mock_api_module, mock_api):
-    """Test the get_task resource."""
-    # Set the mock API
-    mock_api_module.get_task.return_value = mock_api.get_task.return_value
+def test_get_task(ctx, api):
+    """Test the tasks://{task_id} resource."""
+    task = api.add_task("Test Task 1", "Description for test task 1")
     
     # Call the function
-    result = mcp_server.get_task("test-task-1")
+    result = asyncio.run(mcp_server.get_task(task["id"], ctx))
     
     # Assert the result
-    expected = json.dumps(mock_api.get_task.return_value, indent=2)
+    expected = json.dumps(task, indent=2)
     assert result == expected
-    mock_api_module.get_task.assert_called_once_with("test-task-1")
+    assert asyncio.run(mcp_server.get_task("missing", ctx)) == "Task not found"
 
 
-@patch("mcp_server.api")
-def test_add_task(mock_api_module, mock_api):
-    """Test the add_task tool."""
-    # Set the mock API
-    mock_api_module.add_task.return_value = mock_api.add_task.return_value
+def test_malformed_id(ctx, api):
+    """Test that malformed IDs are reported as not found."""
+    api.add_task("Test Task 1")
     
+    result = asyncio.run(mcp_server.get_task_tool("../tasks", ctx))
+    assert result == {"error": "Task not found"}
+    result = asyncio.run(mcp_server.delete_task("", ctx))
+    assert result == {"success": False, "message": "Task not found"}
+    assert len(api.get_all_tasks()) == 1
+
+
+def test_get_all_tasks_sees_changes(ctx, api):
+    """Test that a cached resource payload is not served after a change."""
+    task = api.add_task("Old Title")
+    asyncio.run(mcp_server.get_all_tasks())
+    
+    api.update_task(task["id"], title="New Title")
+    result = asyncio.run(mcp_server.get_all_tasks())
+    
+    assert json.loads(result)[0]["title"] == "New Title"
+
+
+def test_add_task(ctx, api):
+    """Test the add_task tool."""
     # Call the function
-    result = mcp_server.add_task(
+    result = asyncio.run(mcp_server.add_task(
         title="New Task",
+        ctx=ctx,
         description="Description for new task",
         priority=1,
         status="not_started"
-    )
+    ))
     
     # Assert the result
-    assert result == mock_api.add_task.return_value
-    mock_api_module.add_task.assert_called_once_with(
-        "New Task", "Description for new task", 1, "not_started"
-    )
-    mock_api_module.save_all.assert_called_once()
+    assert result["title"] == "New Task"
+    assert api.get_task(result["id"]) == result
+    
+    # The task has been written to the data file
+    assert not api.has_unsaved_changes()
+    with open(api.task_manager.file_path, encoding="utf-8") as f:
+        assert json.load(f) == [result]
+
+
+def test_reload_external_change(ctx, api, tmp_path):
+    """Test that a data file changed by another process is reloaded."""
+    asyncio.run(mcp_server.add_task(title="Ours", ctx=ctx))
+    
+    other = TaskManager(str(tmp_path / "tasks.json"), str(tmp_path / "notes.txt"))
+    other.add_task("Theirs")
+    
+    result = asyncio.run(mcp_server.get_all_tasks_tool(ctx))
+    assert [task["title"] for task in result] == ["Ours", "Theirs"]
+
+
+def test_client_session(tmp_path, monkeypatch):
+    """Test the registered resources and tools through a real client session."""
+    data_dir = tmp_path / ".tasktracker"
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(mcp_server, "data_dir", str(data_dir))
+    monkeypatch.setattr(mcp_server, "task_file", str(data_dir / "tasks.json"))
+    monkeypatch.setattr(mcp_server, "plan_file", str(data_dir / "plan.json"))
+    monkeypatch.setattr(mcp_server, "notes_file", str(data_dir / "notes.txt"))
+    
+    async def run():
+        async with create_connected_server_and_client_session(
+            mcp_server.mcp._mcp_server
+        ) as client:
+            resources = (await client.list_resources()).resources
+            assert sorted(str(r.uri) for r in resources) == [
+                "notes://all", "plan://all", "tasks://all"
+            ]
+            tools = (await client.list_tools()).tools
+            assert "add_task" in {tool.name for tool in tools}
+            
+            result = await client.call_tool("add_task", {"title": "From Client"})
+            assert not result.isError
+            task = json.loads(result.content[0].text)
+            
+            tasks = await client.read_resource("tasks://all")
+            assert json.loads(tasks.contents[0].text) == [task]
+            plan = await client.read_resource("plan://all")
+            assert json.loads(plan.contents[0].text) == []
+            notes = await client.read_resource("notes://all")
+            assert notes.contents[0].text == ""
+            
+            found = await client.read_resource(f"tasks://{task['id']}")
+            assert json.loads(found.contents[0].text) == task
+        return task
+    
+    task = asyncio.run(run())
+    
+    # The server saved the new task before shutting down
+    with open(data_dir / "tasks.json", encoding="utf-8") as f:
+        assert json.load(f) == [task]
+
+
+# Deselected by default; run with `pytest -m benchmark`
+@pytest.mark.benchmark(group="get_all_tasks")
+@pytest.mark.parametrize("size", [10, 1000, 10000])
+def test_get_all_tasks_benchmark(benchmark, ctx, api, size):
+    """Benchmark encoding the tasks://all resource for a range of sizes."""
+    for i in range(size):
+        api.add_task(f"Task {i}", "Description " * 5, i % 3 + 1)
+    
+    def read_uncached():
+        # Measure the encoding, not the cached payload
+        mcp_server._encoded.clear()
+        return asyncio.run(mcp_server.get_all_tasks())
+    
+    result = benchmark(read_uncached)
+    assert len(json.loads(result)) == size
 
 
 def test_add_task_prompt():
     """Test the add_task_prompt."""
     result = mcp_server.add_task_prompt(
-        title="Test Task", 
+        title="Test Task",
         description="Task description"
     )
     
@@ -126,4 +208,4 @@ def test_create_plan_prompt():
     result = mcp_server.create_plan_prompt()
     
     assert "project plan" in result.lower()
-    assert "clear steps" in result.lower()
\ No newline at end of file
+    assert "clear steps" in result.lower()
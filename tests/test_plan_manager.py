@@ -0,0 +1,87 @@
+"""
+Tests for the plan step ordering of the PlanManager.
+"""
+import json
+
+import pytest
+
+from app.core.plan_manager import PlanManager
+
+
+@pytest.fixture
+def plan(tmp_path):
+    """Create a PlanManager with three steps in a temporary file."""
+    plan = PlanManager(str(tmp_path / "plan.json"))
+    for name in ("First", "Second", "Third"):
+        plan.add_step(name)
+    return plan
+
+
+def names(plan):
+    """Return the step names in list order, checking each order matches."""
+    steps = plan.get_all_steps()
+    assert [step["order"] for step in steps] == list(range(len(steps)))
+    return [step["name"] for step in steps]
+
+
+def test_add_step_in_middle(plan):
+    """Test that a step added with an order is inserted at that position."""
+    step = plan.add_step("Inserted", order=1)
+
+    assert step["order"] == 1
+    assert names(plan) == ["First", "Inserted", "Second", "Third"]
+
+
+def test_add_step_clamps_order(plan):
+    """Test that out-of-range orders place the step at the end or start."""
+    plan.add_step("Last", order=100)
+    plan.add_step("Start", order=-5)
+
+    assert names(plan) == ["Start", "First", "Second", "Third", "Last"]
+
+
+def test_move_step_down_and_up(plan):
+    """Test that changing a step's order moves it within the plan."""
+    first = plan.get_all_steps()[0]
+
+    plan.update_step(first["id"], order=2)
+    assert names(plan) == ["Second", "Third", "First"]
+
+    plan.update_step(first["id"], order=0)
+    assert names(plan) == ["First", "Second", "Third"]
+
+
+def test_move_step_clamps_order(plan):
+    """Test that moving a step past the end places it last."""
+    first = plan.get_all_steps()[0]
+
+    plan.update_step(first["id"], order=100)
+
+    assert first["order"] == 2
+    assert names(plan) == ["Second", "Third", "First"]
+
+
+def test_delete_step_renumbers(plan):
+    """Test that deleting a step renumbers the steps after it."""
+    second = plan.get_all_steps()[1]
+
+    assert plan.delete_step(second["id"])
+
+    assert names(plan) == ["First", "Third"]
+    assert plan.get_step(second["id"]) is None
+
+
+def test_load_steps_without_order(tmp_path):
+    """Test that steps saved without an order keep their file order."""
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps([
+        {"id": "a", "name": "A", "completed": False},
+        {"id": "b", "name": "B", "completed": False},
+        {"id": "c", "name": "C", "completed": False},
+    ]), encoding="utf-8")
+    plan = PlanManager(str(path))
+
+    assert names(plan) == ["A", "B", "C"]
+
+    plan.update_step("c", order=0)
+    assert names(plan) == ["C", "A", "B"]